@@ -1,10 +1,15 @@
 """Classes for modeling player and non-player characters."""
 
 import logging
+from array import array
 
 class Actor():
     """A representation of a game character."""
 
+    # Fixed attributes keep large rosters small.
+    __slots__ = ('name', 'hp', 'max_hp', 'min_damage', 'max_damage',
+                 'retreat_ratio', 'initiative')
+
     def __init__(self, name='actor_name'):
         """Initialize character attributes."""
         # Set default attributes.
@@ -13,15 +18,19 @@ class Actor():
         self.min_damage = 1
         self.max_damage = 2
         self.retreat_ratio = 0
+        # Higher initiative acts earlier in each round of a battle.
+        self.initiative = 0
         self.heal()
 
     def log_properties(self):
         """Log debug information about character properties."""
-        logging.debug("Name: " + self.name)
-        logging.debug("HP: " + str(self.hp))
-        logging.debug("Max HP: " + str(self.max_hp))
-        logging.debug("Max damage: " + str(self.max_damage))
-        logging.debug("Min damage: " + str(self.min_damage))
+        if not logging.root.isEnabledFor(logging.DEBUG):
+            return
+        logging.debug("Name: %s", self.name)
+        logging.debug("HP: %s", self.hp)
+        logging.debug("Max HP: %s", self.max_hp)
+        logging.debug("Max damage: %s", self.max_damage)
+        logging.debug("Min damage: %s", self.min_damage)
 
     def heal(self, hp=0):
         """Heal fully (default) or by fixed hp."""
@@ -36,6 +45,8 @@ class Actor():
 class Player(Actor):
     """A representation of a player character."""
 
+    __slots__ = ()
+
     def __init__(self, name='Player'):
         """Initialize character attributes."""
         super().__init__()
@@ -44,3 +55,76 @@ class Player(Actor):
         self.retreat_ratio = 0.1
 
 
+class ActorArray():
+    """A roster of characters stored as typed arrays.
+
+    Entry i of each array holds the stats of character i, so a roster
+    needs no per-character objects. The arrays support the buffer
+    protocol and can be wrapped by NumPy without copying.
+    """
+
+    def __init__(self, name='actor_name'):
+        """Initialize an empty roster."""
+        self.name = name
+        self.hp = array('q')
+        self.max_hp = array('q')
+        self.min_damage = array('q')
+        self.max_damage = array('q')
+        self.retreat_ratio = array('d')
+
+    @classmethod
+    def from_actor(cls, actor, size):
+        """Create a roster of size copies of an actor."""
+        roster = cls(actor.name)
+        roster.hp = array('q', [actor.hp]) * size
+        roster.max_hp = array('q', [actor.max_hp]) * size
+        roster.min_damage = array('q', [actor.min_damage]) * size
+        roster.max_damage = array('q', [actor.max_damage]) * size
+        roster.retreat_ratio = array('d', [actor.retreat_ratio]) * size
+        return roster
+
+    def __len__(self):
+        """Return the number of characters."""
+        return len(self.hp)
+
+    def append(self, actor):
+        """Add the stats of an actor to the roster."""
+        self.hp.append(actor.hp)
+        self.max_hp.append(actor.max_hp)
+        self.min_damage.append(actor.min_damage)
+        self.max_damage.append(actor.max_damage)
+        self.retreat_ratio.append(actor.retreat_ratio)
+
+    def get(self, i):
+        """Return character i as an Actor."""
+        actor = Actor(self.name)
+        actor.hp = self.hp[i]
+        actor.max_hp = self.max_hp[i]
+        actor.min_damage = self.min_damage[i]
+        actor.max_damage = self.max_damage[i]
+        actor.retreat_ratio = self.retreat_ratio[i]
+        return actor
+
+    def heal(self, hp=0):
+        """Heal every character fully (default) or by fixed hp."""
+        # Assign to a full slice so hp keeps its buffer and any NumPy
+        # views of it see the new values.
+        if hp == 0:
+            self.hp[:] = self.max_hp
+        # Heal by fixed hp where that stays within max hp, as Actor.heal
+        else:
+            self.hp[:] = array('q', [
+                    current + hp if current + hp <= max_hp else max_hp
+                    for current, max_hp in zip(self.hp, self.max_hp)])
+
+    def damage(self, amounts):
+        """Subtract damage from each character's hp.
+
+        Args:
+            amounts: Damage per character, in roster order.
+        """
+        if len(amounts) != len(self.hp):
+            raise ValueError("Need one damage amount per character.")
+        self.hp[:] = array('q', [
+                current - amount
+                for current, amount in zip(self.hp, amounts)])
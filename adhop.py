@@ -1,4 +1,10 @@
 import sys
+import copy
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 import pygame
 
 import flags
@@ -6,39 +12,197 @@ from background import Background
 from actor import Player
 from stats import Statistics
 from mission import MissionList
+from catalog import MissionCatalog
+from difficulty import DifficultyService
+from rng import GameRandom
+from save import SaveFile
+from replay import ReplayLog
 import screen
 
-def main():
-    """Run the game."""
-    flags.init_flags("Adorable Hopelessness RPG.")
+def play(bg, player, stats, mission_list, save_file=None, name=True):
+    """Run the game flow from naming the player onwards.
 
-    # Initialize game and create a background surface object.
-    pygame.init()
-    bg = Background()
-    pygame.display.set_caption("Adorable Hopelessness")
+    Args:
+        bg: The background surface.
+        player: The player character.
+        stats: (Statistics) Mission results.
+        mission_list: (MissionList) Missions to choose from.
+        save_file: (SaveFile) Optional file to autosave results to.
+        name: (bool) Ask for the player's name first.
+    """
+    difficulty = DifficultyService(player)
+    screens = screen.ScreenManager(bg)
 
     # Set player name
-    player = Player()
-    screen.PlayerNameScreen(bg, player).run()
-
-    # Initialize stats
-    stats = Statistics()
-
-    # Create mission list
-    mission_list = MissionList()
+    if name:
+        screens.get(screen.PlayerNameScreen, player).run()
+    if save_file:
+        save_file.save(player, stats, _catalog(mission_list))
 
     # Loop ready / results
     while True:
         # Ready to adventure?
-        screen.ReadyScreen(bg, player).run()
+        screens.get(screen.ReadyScreen, player).run()
 
         # Choose an adventure
-        screen.AdventureMenuScreen(bg, mission_list).run()
+        screens.get(screen.AdventureMenuScreen, mission_list,
+                    difficulty).run()
 
         # Run adventure
-        screen.AdventureResultScreen(bg, stats, player,
-                mission_list.get_active_mission()).run()
+        mission = mission_list.get_active_mission()
+        screens.get(screen.AdventureResultScreen, stats, player,
+                    mission).run()
+        if save_file:
+            save_file.append_result(mission.result, player.hp)
+
+
+async def play_async(bg, player, stats, mission_list, save_file=None,
+                     name=True, missions=0):
+    """Run the game flow like play, with slow work in the background.
+
+    Combat is resolved in an executor while the result screen shows
+    "Resolving...", saves run in order on their own thread, and a
+    mission catalog can be generated while the first screens are shown.
+
+    Args:
+        bg: The background surface.
+        player: The player character.
+        stats: (Statistics) Mission results.
+        mission_list: (MissionList) Missions to choose from.
+        save_file: (SaveFile) Optional file to autosave results to.
+        name: (bool) Ask for the player's name first.
+        missions: (int) Number of missions to generate in the background
+            and offer instead of mission_list's own, default none. They
+            are aimed at a spread of win chances for the player.
+    """
+    loop = asyncio.get_running_loop()
+    difficulty = DifficultyService(player)
+    screens = screen.ScreenManager(bg)
+    catalog = None
+    if missions:
+        catalog = loop.run_in_executor(None, partial(MissionCatalog.generate,
+                missions, mission_list.rng.spawn(), difficulty=difficulty))
+
+    # One thread keeps saves in order. Leaving the block waits for them.
+    with ThreadPoolExecutor(max_workers=1) as saver:
+        saves = []
+
+        def save(function, *args):
+            """Queue a save, raising the error of any finished one."""
+            for future in [future for future in saves if future.done()]:
+                saves.remove(future)
+                future.result()
+            saves.append(loop.run_in_executor(saver, function, *args))
+
+        def save_game(catalog):
+            """Queue a snapshot save of the game as it is now.
+
+            The player and statistics are copied here, on the event loop,
+            because combat updates them on other threads.
+            """
+            save(save_file.save, copy.copy(player), stats.snapshot(),
+                 catalog)
+
+        # Set player name
+        if name:
+            await screens.get(screen.PlayerNameScreen, player).run_async()
+        if save_file and catalog is None:
+            save_game(_catalog(mission_list))
+
+        # Loop ready / results
+        while True:
+            # Ready to adventure?
+            await screens.get(screen.ReadyScreen, player).run_async()
+
+            # Switch to generated missions once they are ready.
+            if catalog is not None:
+                await screens.get(screen.WaitScreen,
+                        "Generating missions...", catalog).run_async()
+                mission_list.missions = catalog.result()
+                catalog = None
+                if save_file:
+                    save_game(mission_list.missions)
+
+            # Choose an adventure
+            await screens.get(screen.AdventureMenuScreen, mission_list,
+                              difficulty).run_async()
+
+            # Run adventure
+            mission = mission_list.get_active_mission()
+            await screens.get(screen.AdventureResultScreen, stats, player,
+                              mission, resolve=False).run_async()
+            if save_file:
+                save(save_file.append_result, mission.result, player.hp)
+
+
+def _catalog(mission_list):
+    """Return the catalog of a mission list, or None."""
+    if isinstance(mission_list.missions, MissionCatalog):
+        return mission_list.missions
+    return None
+
+
+def add_arguments(parser):
+    """Add game arguments."""
+    parser.add_argument("--record", help="record input events to FILE",
+                        metavar="FILE")
+    parser.add_argument("--save", help="load and autosave the game in FILE",
+                        metavar="FILE")
+    parser.add_argument("--missions", help="generate N missions",
+                        type=int, default=0, metavar="N")
+    parser.add_argument("--replays", help="append a replay of every fight "
+                        "to FILE", metavar="FILE")
+
+
+def main():
+    """Run the game."""
+    args = flags.init_flags("Adorable Hopelessness RPG.", add_arguments)
+
+    # Initialize game and create a background surface object.
+    pygame.init()
+    bg = Background()
+    pygame.display.set_caption("Adorable Hopelessness")
+
+    # Record input and seed for replay with session.py.
+    seed = None
+    if args.record:
+        import session
+        recorder = session.Recorder(args.record)
+        screen.Screen.event_source = recorder
+        seed = recorder.seed
+
+    # Continue a saved game if there is one.
+    save_file = None
+    loaded = False
+    player, stats, catalog = Player(), Statistics(), None
+    if args.save:
+        save_file = SaveFile(args.save)
+        if save_file.exists():
+            player, stats, catalog = save_file.load()
+            loaded = True
+
+    # Keep replays of the fights the player sees.
+    if args.replays:
+        screen.AdventureResultScreen.replay_log = ReplayLog(args.replays)
 
+    try:
+        mission_list = MissionList(GameRandom(seed), catalog)
+        if args.record:
+            # session.py replays recordings through play, so record the
+            # same synchronous game loop.
+            if args.missions:
+                logging.warning("--missions is ignored with --record.")
+            play(bg, player, stats, mission_list, save_file,
+                 name=not loaded)
+        else:
+            asyncio.run(play_async(bg, player, stats, mission_list,
+                    save_file, name=not loaded,
+                    missions=0 if catalog else args.missions))
+    finally:
+        if args.replays:
+            screen.AdventureResultScreen.replay_log.close()
 
-main()
 
+# Execute this only if running as a standalone
+if __name__ == "__main__":
+    main()
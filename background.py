@@ -1,11 +1,25 @@
 """Classes for managing background surfaces."""
 
+import os
+
 import pygame
 
 class Background():
     """A representation of the background surface."""
 
-    def __init__(self, resolution=(600,400), color=(230,230,230)):
+    def __init__(self, resolution=(600,400), color=(230,230,230),
+                 headless=False):
+        """Initialize background attributes.
+
+        Args:
+            resolution: (tuple) Width and height of the surface.
+            color: (tuple) Background fill color.
+            headless: (bool) Render offscreen with SDL's dummy video
+                driver instead of opening a window, unless the display
+                is already initialized.
+        """
+        if headless and not pygame.display.get_init():
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            pygame.display.init()
         self.surface = pygame.display.set_mode(resolution)
         self.color = color
-
@@ -0,0 +1,275 @@
+"""Sweep player stats over many fights to check combat balance."""
+
+import os
+import math
+import logging
+import itertools
+from statistics import NormalDist
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import flags
+from actor import Player
+from mission import Mission, WIN, LOSE, RETREAT
+from rng import GameRandom
+from stats import Statistics
+
+# The outcome of an adaptive estimate. decisions maps each result to True
+# if its ratio is inside its band, False if outside, or None if max_runs
+# fights could not tell.
+Estimate = namedtuple('Estimate', ['runs', 'stats', 'decisions'])
+
+RESULT_NAMES = {WIN: 'win', LOSE: 'lose', RETREAT: 'retreat'}
+
+def make_player(max_hp, damage, retreat_ratio):
+    """Create a player with the stats of one grid cell."""
+    player = Player()
+    player.max_hp = max_hp
+    player.min_damage, player.max_damage = damage
+    player.retreat_ratio = retreat_ratio
+    player.heal()
+    return player
+
+
+def make_grid(max_hps, damages, retreat_ratios):
+    """Return every combination of player stats as (max_hp, damage,
+    retreat_ratio) cells."""
+    return list(itertools.product(max_hps, damages, retreat_ratios))
+
+
+def run_chunk(cell, runs, seed):
+    """Run a chunk of fights for one grid cell.
+
+    Args:
+        cell: (tuple) Player stats as (max_hp, damage, retreat_ratio).
+        runs: (int) Number of fights.
+        seed: Seed for this chunk's random number stream.
+
+    Returns:
+        (tuple) The cell and a Statistics of the fight results.
+    """
+    # Each chunk gets its own stream, so results do not depend on which
+    # worker runs it.
+    player = make_player(*cell)
+    mission = Mission(rng=GameRandom(seed))
+    stats = Statistics()
+    for i in range(runs):
+        player.heal()
+        mission.enemy.heal()
+        stats.update(mission.resolve_combat(player))
+    return cell, stats
+
+
+def _run_chunk(args):
+    """Unpack arguments for run_chunk in a worker process."""
+    return run_chunk(*args)
+
+
+def sweep(grid, runs, workers=None, chunk_size=1000, seed=None):
+    """Run fights for every cell of a grid over a process pool.
+
+    Args:
+        grid: (list) Cells of player stats from make_grid.
+        runs: (int) Number of fights per cell.
+        workers: (int) Number of worker processes, default one per core.
+        chunk_size: (int) Number of fights per unit of work.
+        seed: Seed for the random number streams.
+
+    Returns:
+        (dict) Statistics for each cell.
+    """
+    # Draw an independent seed for every chunk up front.
+    seeder = GameRandom(seed)
+    chunks = []
+    for cell in grid:
+        for start in range(0, runs, chunk_size):
+            chunks.append((cell, min(chunk_size, runs - start),
+                           seeder.getrandbits(64)))
+
+    results = {cell: Statistics() for cell in grid}
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Batch several chunks per task to keep IPC overhead low.
+        batch = max(1, len(chunks) // (4 * workers))
+        for cell, stats in executor.map(_run_chunk, chunks,
+                                        chunksize=batch):
+            results[cell].merge(stats)
+    return results
+
+
+def wilson_interval(successes, n, z):
+    """Return the Wilson score interval of a proportion.
+
+    Args:
+        successes: (int) Number of successes.
+        n: (int) Number of trials.
+        z: (float) Standard normal quantile of the confidence level.
+    """
+    p = successes / n
+    denominator = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denominator
+    half = z / denominator * math.sqrt(p * (1 - p) / n
+                                       + z * z / (4 * n * n))
+    return center - half, center + half
+
+
+def estimate(player, mission, bands, confidence=0.999, min_runs=100,
+             max_runs=200000):
+    """Run fights until each result ratio is known to be in or out of
+    its band.
+
+    Ratios are checked after min_runs fights and then every time the
+    fight count doubles. The error rate is split across checks and bands
+    (Bonferroni), so with probability at least confidence no decision is
+    wrong. Clear cases stop after a few hundred fights, while ratios near
+    a band edge keep running up to max_runs.
+
+    Args:
+        player: The player character.
+        mission: The mission to fight over and over.
+        bands: (dict) (low, high) ratio bands keyed by "Constants" WIN,
+            LOSE or RETREAT.
+        confidence: (float) Probability that all decisions are right.
+        min_runs: (int) Fights before the first check.
+        max_runs: (int) Most fights to run.
+
+    Returns:
+        (Estimate) Fights run, their Statistics and the decisions.
+    """
+    checks = max(1, math.ceil(math.log2(max_runs / min_runs)) + 1)
+    alpha = (1 - confidence) / (checks * len(bands))
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+
+    stats = Statistics()
+    counts = {WIN: 'wins', LOSE: 'losses', RETREAT: 'retreats'}
+    runs = 0
+    target = min(min_runs, max_runs)
+    while True:
+        for i in range(target - runs):
+            player.heal()
+            mission.enemy.heal()
+            stats.update(mission.resolve_combat(player))
+        runs = target
+
+        decisions = {}
+        for result, (low, high) in bands.items():
+            lower, upper = wilson_interval(
+                    getattr(stats, counts[result]), runs, z)
+            if low <= lower and upper <= high:
+                decisions[result] = True
+            elif upper < low or high < lower:
+                decisions[result] = False
+            else:
+                decisions[result] = None
+
+        if None not in decisions.values() or runs >= max_runs:
+            return Estimate(runs, stats, decisions)
+        target = min(2 * runs, max_runs)
+
+
+def estimate_cell(cell, bands, seed, confidence=0.999, min_runs=100,
+                  max_runs=200000):
+    """Estimate the result ratios of one grid cell against the default
+    enemy. Returns the cell and its Estimate."""
+    player = make_player(*cell)
+    mission = Mission(rng=GameRandom(seed))
+    return cell, estimate(player, mission, bands, confidence, min_runs,
+                          max_runs)
+
+
+def _estimate_cell(args):
+    """Unpack arguments for estimate_cell in a worker process."""
+    return estimate_cell(*args)
+
+
+def sweep_adaptive(grid, bands, workers=None, seed=None, confidence=0.999,
+                   min_runs=100, max_runs=200000):
+    """Estimate every cell of a grid with early stopping over a process
+    pool, one cell per unit of work.
+
+    Returns:
+        (dict) Estimate for each cell.
+    """
+    seeder = GameRandom(seed)
+    cells = [(cell, bands, seeder.getrandbits(64), confidence, min_runs,
+              max_runs) for cell in grid]
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return dict(executor.map(_estimate_cell, cells))
+
+
+def parse_damage(text):
+    """Parse a damage range given as MIN-MAX."""
+    min_damage, max_damage = text.split('-')
+    return (int(min_damage), int(max_damage))
+
+
+def add_arguments(parser):
+    """Add balance sweep arguments."""
+    parser.add_argument("--max-hp", help="player max hp values",
+                        type=int, nargs="+", default=[10])
+    parser.add_argument("--damage", help="player damage ranges as MIN-MAX",
+                        type=parse_damage, nargs="+", default=[(1, 3)])
+    parser.add_argument("--retreat-ratio", help="player retreat ratios",
+                        type=float, nargs="+", default=[0.1])
+    parser.add_argument("--runs", help="fights per stat combination",
+                        type=int, default=10000)
+    parser.add_argument("--workers", help="number of worker processes",
+                        type=int)
+    parser.add_argument("--chunk-size", help="fights per unit of work",
+                        type=int, default=1000)
+    parser.add_argument("--seed", help="random seed", type=int)
+
+
+def add_band_arguments(parser):
+    """Add balance sweep arguments and early stopping arguments."""
+    add_arguments(parser)
+    for result, name in RESULT_NAMES.items():
+        parser.add_argument("--" + name + "-band", help="stop each stat "
+                            "combination early once its " + name + " ratio "
+                            "is known to be in or out of LOW-HIGH",
+                            type=float, nargs=2, metavar=("LOW", "HIGH"))
+    parser.add_argument("--confidence", help="confidence of band decisions",
+                        type=float, default=0.999)
+
+
+def main():
+    """Run a balance sweep from the command line."""
+    args = flags.init_flags("Combat balance sweep.", add_band_arguments)
+    grid = make_grid(args.max_hp, args.damage, args.retreat_ratio)
+    bands = {result: tuple(getattr(args, name + '_band'))
+             for result, name in RESULT_NAMES.items()
+             if getattr(args, name + '_band')}
+    if bands:
+        report_bands(sweep_adaptive(grid, bands, args.workers, args.seed,
+                                    args.confidence, max_runs=args.runs),
+                     bands)
+        return
+
+    logging.info("Running %d fights for %d stat combinations.",
+                 args.runs, len(grid))
+
+    results = sweep(grid, args.runs, args.workers, args.chunk_size,
+                    args.seed)
+    for (max_hp, damage, retreat_ratio), stats in results.items():
+        total = stats.total()
+        print("max_hp=%d damage=%d-%d retreat_ratio=%g: "
+              "win %.1f%% lose %.1f%% retreat %.1f%%"
+              % (max_hp, damage[0], damage[1], retreat_ratio,
+                 100 * stats.wins / total, 100 * stats.losses / total,
+                 100 * stats.retreats / total))
+
+
+def report_bands(results, bands):
+    """Print the band decisions of an adaptive sweep."""
+    words = {True: 'in', False: 'out', None: 'undecided'}
+    for (max_hp, damage, retreat_ratio), result in results.items():
+        print("max_hp=%d damage=%d-%d retreat_ratio=%g: %d fights, %s"
+              % (max_hp, damage[0], damage[1], retreat_ratio, result.runs,
+                 ", ".join(RESULT_NAMES[key] + " " + words[decision]
+                           for key, decision in result.decisions.items())))
+
+
+# Execute this only if running as a standalone
+if __name__ == "__main__":
+    main()
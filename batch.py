@@ -0,0 +1,88 @@
+"""Functions for resolving many combat missions at once."""
+
+import numpy as np
+
+from actor import ActorArray
+from mission import WIN, LOSE, RETREAT
+
+class BatchResult():
+    """The results of a batch of independent fights."""
+
+    def __init__(self, results, player_hp, enemy_hp):
+        """Initialize batch result attributes."""
+        self.results = results
+        self.player_hp = player_hp
+        self.enemy_hp = enemy_hp
+
+        # Tally results.
+        counts = np.bincount(results, minlength=3)
+        self.wins = int(counts[WIN])
+        self.losses = int(counts[LOSE])
+        self.retreats = int(counts[RETREAT])
+
+
+def _columns(actor, n):
+    """Return hp, min damage, max damage and retreat hp of an Actor or
+    ActorArray as arrays of n entries."""
+    if isinstance(actor, ActorArray):
+        if len(actor) != n:
+            raise ValueError("Need one roster entry per fight.")
+        hp = np.frombuffer(actor.hp, dtype=np.int64)
+        min_damage = np.frombuffer(actor.min_damage, dtype=np.int64)
+        max_damage = np.frombuffer(actor.max_damage, dtype=np.int64)
+        retreat_hp = (np.frombuffer(actor.max_hp, dtype=np.int64)
+                      * np.frombuffer(actor.retreat_ratio))
+        return hp, min_damage, max_damage, retreat_hp
+
+    return (np.full(n, actor.hp), np.full(n, actor.min_damage),
+            np.full(n, actor.max_damage),
+            np.full(n, actor.max_hp * actor.retreat_ratio))
+
+
+def resolve_combat_batch(player, enemy, n, seed=None):
+    """Resolve n independent fights between player and enemy.
+
+    Every fight starts from the current hp of each actor and follows the
+    same rules as Mission.resolve_combat. Either side may be an
+    ActorArray with one character per fight. The actors are not
+    modified.
+
+    Args:
+        player: The player character or an ActorArray of players.
+        enemy: The enemy character or an ActorArray of enemies.
+        n: (int) Number of fights to simulate.
+        seed: Seed for the random number generator.
+
+    Returns:
+        (BatchResult) Per-fight results and remaining hp.
+    """
+    rng = np.random.default_rng(seed)
+
+    # Row 0 is the player and row 1 is the enemy.
+    hp, min_damage, max_damage, retreat_hp = (
+            np.stack(column) for column in
+            zip(_columns(player, n), _columns(enemy, n)))
+
+    # Randomize whether player or enemy hits first.
+    attacker = rng.integers(0, 2, size=n)
+    fights = np.arange(n)
+
+    # Perform one turn of every fight still in progress.
+    while fights.size:
+        # End combat if attacker has hp less than retreat ratio.
+        going = hp[attacker, fights] > retreat_hp[attacker, fights]
+        fights = fights[going]
+        attacker = attacker[going]
+
+        damage = rng.integers(min_damage[attacker, fights],
+                              max_damage[attacker, fights] + 1)
+        hp[1 - attacker, fights] -= damage
+        attacker = 1 - attacker
+
+    # Report results.
+    player_hp, enemy_hp = hp
+    results = np.where(
+            enemy_hp <= 0, WIN, np.where(player_hp > 0, RETREAT, LOSE))
+    player_hp[results == LOSE] = 0
+
+    return BatchResult(results, player_hp, enemy_hp)
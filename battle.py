@@ -0,0 +1,173 @@
+"""Classes for resolving battles between parties of characters."""
+
+import heapq
+import logging
+
+import flags
+from mission import (WIN, LOSE, RETREAT, PLAYER_SIDE, ENEMY_SIDE,
+                     HitEvent, FightEvent)
+from rng import GameRandom
+
+class LivingIndex():
+    """The combatants of one side that are still fighting.
+
+    Combatants are stored in a list with a map from combatant to list
+    position, so adding, removing and picking a random combatant all take
+    constant time.
+    """
+
+    def __init__(self):
+        """Initialize an empty index."""
+        self.members = []
+        self.positions = {}
+
+    def __len__(self):
+        """Return the number of combatants still fighting."""
+        return len(self.members)
+
+    def __contains__(self, combatant):
+        """Return True if combatant is still fighting."""
+        return combatant in self.positions
+
+    def add(self, combatant):
+        """Add a combatant (an index into Battle.combatants)."""
+        self.positions[combatant] = len(self.members)
+        self.members.append(combatant)
+
+    def remove(self, combatant):
+        """Remove a combatant by swapping it with the last one."""
+        position = self.positions.pop(combatant)
+        last = self.members.pop()
+        if last != combatant:
+            self.members[position] = last
+            self.positions[last] = position
+
+    def choice(self, rng):
+        """Return a random combatant still fighting."""
+        return self.members[int(rng.random() * len(self.members))]
+
+
+class Battle():
+    """A battle between a party of players and a horde of enemies.
+
+    Every round each combatant still fighting acts once, in order of
+    initiative with ties broken at random. A combatant whose hp is at or
+    below its retreat ratio withdraws on its turn, otherwise it hits a
+    random opponent still fighting. The battle ends when one side has no
+    combatants left fighting.
+
+    Turns come from a heap keyed by (round, rank), and combatants that
+    fall or withdraw are dropped from the heap lazily, so each turn takes
+    O(log n) time for n combatants.
+    """
+
+    def __init__(self, players, enemies, title='Battle', rng=None):
+        """Initialize battle attributes.
+
+        Args:
+            players: Characters on the player side.
+            enemies: Characters on the enemy side.
+            title: (str) Battle title, used in FightEvents.
+            rng: (GameRandom) Random number stream for combat, default a
+                new unseeded stream.
+        """
+        players = list(players)
+        enemies = list(enemies)
+        if not players or not enemies:
+            raise ValueError("Both sides need at least one combatant.")
+
+        self.title = title
+        self.rng = rng if rng is not None else GameRandom()
+        self.combatants = players + enemies
+        self.sides = ([PLAYER_SIDE] * len(players)
+                      + [ENEMY_SIDE] * len(enemies))
+
+        # Default result is None.
+        self.result = None
+
+    def initiative_order(self):
+        """Return combatant indexes in turn order for one round."""
+        ranks = list(range(len(self.combatants)))
+        self.rng.shuffle(ranks)
+        return sorted(ranks, key=lambda i: -self.combatants[i].initiative)
+
+    def resolve_combat(self, events=None):
+        """Resolve the battle.
+
+        Args:
+            events: Optional sink with an append method that receives a
+                HitEvent for every hit and a FightEvent at the end.
+
+        Returns:
+            (int) "Constants" WIN, RETREAT, or LOSE for the player side
+        """
+        trace = (flags.trace_combat
+                 and logging.root.isEnabledFor(logging.DEBUG))
+        combatants = self.combatants
+        sides = self.sides
+        rng = self.rng
+        rolls = [rng.damage_rolls(actor.min_damage, actor.max_damage)
+                 for actor in combatants]
+
+        # Index the combatants still fighting on each side.
+        living = (LivingIndex(), LivingIndex())
+        for i, side in enumerate(sides):
+            living[side].add(i)
+
+        # Schedule the first round.
+        queue = [(0, rank, i)
+                 for rank, i in enumerate(self.initiative_order())]
+        heapq.heapify(queue)
+
+        turn = 0
+        while living[PLAYER_SIDE] and living[ENEMY_SIDE]:
+            fight_round, rank, i = heapq.heappop(queue)
+            side = sides[i]
+            # Skip combatants that fell or withdrew since being scheduled.
+            if i not in living[side]:
+                continue
+            actor = combatants[i]
+
+            # Withdraw if actor has hp less than retreat ratio.
+            if actor.hp <= actor.max_hp * actor.retreat_ratio:
+                living[side].remove(i)
+                if trace:
+                    logging.debug("%s withdraws.", actor.name)
+                continue
+
+            target = living[1 - side].choice(rng)
+            defender = combatants[target]
+            damage = next(rolls[i])
+            defender.hp -= damage
+            if defender.hp <= 0:
+                living[1 - side].remove(target)
+            if trace:
+                logging.debug("%s hits %s for %d. %d HP remaining.",
+                              actor.name, defender.name, damage, defender.hp)
+            if events is not None:
+                events.append(HitEvent(side, damage, defender.hp, turn))
+            turn += 1
+
+            heapq.heappush(queue, (fight_round + 1, rank, i))
+
+        # Report results.
+        players = [actor for actor, side in zip(combatants, sides)
+                   if side == PLAYER_SIDE]
+        enemies = [actor for actor, side in zip(combatants, sides)
+                   if side == ENEMY_SIDE]
+        if all(enemy.hp <= 0 for enemy in enemies):
+            logging.info("Players won %s.", self.title)
+            self.result = WIN
+        elif any(player.hp > 0 for player in players):
+            logging.info("Players withdrew from %s.", self.title)
+            self.result = RETREAT
+        else:
+            logging.info("Players defeated in %s.", self.title)
+            self.result = LOSE
+        for player in players:
+            if player.hp < 0:
+                player.hp = 0
+
+        if events is not None:
+            events.append(FightEvent(self.title, self.result, turn))
+        return self.result
@@ -0,0 +1,236 @@
+"""Micro-benchmarks for simulation and rendering hot paths."""
+
+import sys
+import logging
+import timeit
+import subprocess
+import tracemalloc
+from time import perf_counter
+
+import flags
+from actor import Player
+from mission import Mission, MissionList
+from catalog import MissionCatalog
+from rng import GameRandom
+
+def bench_hit_message(number=200000):
+    """Time one combat trace message built eagerly and lazily."""
+    name, damage, hp = "Player", 2, 7
+    eager = timeit.timeit(
+            lambda: logging.debug(name + " hits for " + str(damage) + ". "
+                                  + name + " " + str(hp) + " HP remaining."),
+            number=number)
+    lazy = timeit.timeit(
+            lambda: logging.debug("%s hits for %d. %s %d HP remaining.",
+                                  name, damage, name, hp),
+            number=number)
+    guarded = timeit.timeit(
+            lambda: logging.root.isEnabledFor(logging.DEBUG),
+            number=number)
+    return {'eager': eager / number, 'lazy': lazy / number,
+            'guarded': guarded / number}
+
+
+def bench_combat(number=20000):
+    """Time Mission.resolve_combat with and without combat tracing."""
+    player = Player()
+    mission = Mission()
+
+    def fight():
+        player.heal()
+        mission.enemy.heal()
+        mission.resolve_combat(player)
+
+    results = {}
+    root = logging.root
+    level = root.level
+    handlers = root.handlers
+    try:
+        # Debug logging goes nowhere so only formatting cost is timed.
+        root.handlers = [logging.NullHandler()]
+        for name, debug, trace in (('info', False, True),
+                                   ('debug', True, True),
+                                   ('debug, no trace', True, False)):
+            root.setLevel(logging.DEBUG if debug else logging.INFO)
+            flags.trace_combat = trace
+            results[name] = timeit.timeit(fight, number=number) / number
+    finally:
+        root.setLevel(level)
+        root.handlers = handlers
+        flags.trace_combat = True
+    return results
+
+
+def _key(key, char=''):
+    """Return a scripted key press event."""
+    import pygame
+    return pygame.event.Event(pygame.KEYDOWN, key=key, unicode=char)
+
+
+def screen_scripts(bg):
+    """Return (name, screen factory, event script) for each screen.
+
+    Each frame of a script is a list of events posted before the frame.
+    """
+    import pygame
+    import screen
+    from stats import Statistics
+
+    idle = [pygame.event.Event(pygame.USEREVENT)]
+    player = Player('Benchmark')
+    mission_list = MissionList()
+    catalog_list = MissionList(
+            catalog=MissionCatalog.generate(100000, GameRandom(0)))
+    return [
+        ('PlayerNameScreen', lambda: screen.PlayerNameScreen(bg, Player()),
+            [[_key(pygame.K_a, 'a')], [_key(pygame.K_BACKSPACE)]]),
+        ('CharacterScreen', lambda: screen.CharacterScreen(bg, player),
+            [idle]),
+        ('ReadyScreen', lambda: screen.ReadyScreen(bg, player), [idle]),
+        ('AdventureMenuScreen',
+            lambda: screen.AdventureMenuScreen(bg, mission_list), [idle]),
+        ('AdventureMenuScreen, 100k missions',
+            lambda: screen.AdventureMenuScreen(bg, catalog_list),
+            [[_key(pygame.K_DOWN)], [_key(pygame.K_PAGEDOWN)],
+                [_key(pygame.K_UP)]]),
+        ('AdventureResultScreen',
+            lambda: screen.AdventureResultScreen(bg, Statistics(), player,
+                mission_list.missions[0]),
+            [idle]),
+    ]
+
+
+def _percentiles(times):
+    """Return the p50 and p99 of a list of times."""
+    times = sorted(times)
+    return times[len(times) // 2], times[int(len(times) * 0.99)]
+
+
+def bench_screen(make_screen, script, frames=1000):
+    """Drive a screen through a scripted event sequence.
+
+    Every frame posts the next events of the script, lets the screen
+    catch them and redraws the whole screen.
+
+    Returns:
+        (dict) p50/p99 seconds of prep_objects plus baking the static
+        layer, p50/p99 seconds of a frame, and mean bytes allocated per
+        frame.
+    """
+    import pygame
+
+    screen = make_screen()
+    prep_times = []
+    for i in range(frames // 10 or 1):
+        start = perf_counter()
+        screen.prep_objects()
+        screen.bake_layer()
+        prep_times.append(perf_counter() - start)
+
+    def frame(i):
+        for event in script[i % len(script)]:
+            pygame.event.post(event)
+        screen.active = True
+        screen.catch_events()
+        screen.mark_dirty()
+        screen.display()
+
+    frame_times = []
+    for i in range(frames):
+        start = perf_counter()
+        frame(i)
+        frame_times.append(perf_counter() - start)
+
+    # Measure allocations in a separate pass since tracing is slow.
+    allocated = 0
+    tracemalloc.start()
+    for i in range(frames // 10 or 1):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        frame(i)
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    prep_p50, prep_p99 = _percentiles(prep_times)
+    frame_p50, frame_p99 = _percentiles(frame_times)
+    return {'prep p50': prep_p50, 'prep p99': prep_p99,
+            'frame p50': frame_p50, 'frame p99': frame_p99,
+            'bytes/frame': allocated / (frames // 10 or 1)}
+
+
+def bench_screens(frames=1000):
+    """Benchmark every screen on a headless background."""
+    import pygame
+    from background import Background
+
+    bg = Background(headless=True)
+    pygame.init()
+    return {name: bench_screen(make_screen, script, frames)
+            for name, make_screen, script in screen_scripts(bg)}
+
+
+def bench_startup(modules=('mission', 'stats', 'balance', 'screen'),
+                  runs=10):
+    """Time a cold start of a fresh interpreter importing each module.
+
+    Returns the best of runs for each module and for an empty script, so
+    the import cost of a module is its time minus the 'python' time.
+    """
+    results = {}
+    for name, code in [('python', 'pass')] + [
+            (module, 'import ' + module) for module in modules]:
+        best = None
+        for i in range(runs):
+            start = perf_counter()
+            subprocess.run([sys.executable, '-c', code], check=True,
+                           stdout=subprocess.DEVNULL)
+            elapsed = perf_counter() - start
+            if best is None or elapsed < best:
+                best = elapsed
+        results[name] = best
+    return results
+
+
+def report(title, results):
+    """Print benchmark times in microseconds."""
+    print(title)
+    for name, seconds in results.items():
+        print("  %-20s %8.2f us" % (name, seconds * 1e6))
+
+
+def add_arguments(parser):
+    """Add benchmark arguments."""
+    parser.add_argument("--frames", help="frames per screen benchmark",
+                        type=int, default=1000)
+    parser.add_argument("--frame-budget",
+                        help="fail if any screen's p99 frame time exceeds "
+                        "this many milliseconds", type=float)
+
+
+def main():
+    """Run all benchmarks."""
+    args = flags.init_flags("Performance micro-benchmarks.", add_arguments)
+    report("Combat trace message, debug off:", bench_hit_message())
+    report("Mission.resolve_combat per fight:", bench_combat())
+    report("Cold start importing:", bench_startup())
+
+    over_budget = []
+    for name, results in bench_screens(args.frames).items():
+        print(name + ":")
+        for key, value in results.items():
+            if key == 'bytes/frame':
+                print("  %-20s %8.0f" % (key, value))
+            else:
+                print("  %-20s %8.2f us" % (key, value * 1e6))
+        if (args.frame_budget is not None
+                and results['frame p99'] * 1e3 > args.frame_budget):
+            over_budget.append(name)
+
+    if over_budget:
+        print("Over frame budget: " + ", ".join(over_budget))
+        sys.exit(1)
+
+
+# Execute this only if running as a standalone
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""A large, indexed catalog of procedurally generated missions."""
+
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+from mission import Mission
+from rng import GameRandom
+
+# Stats shared by every enemy of a type.
+EnemyTemplate = namedtuple('EnemyTemplate', ['name', 'difficulty', 'max_hp',
+        'min_damage', 'max_damage', 'retreat_ratio'])
+
+ENEMY_TEMPLATES = [
+    EnemyTemplate('Rat', 1, 6, 1, 2, 0),
+    EnemyTemplate('Goblin', 2, 10, 1, 2, 0),
+    EnemyTemplate('Wolf', 3, 10, 1, 3, 0.2),
+    EnemyTemplate('Orc', 4, 14, 1, 3, 0),
+    EnemyTemplate('Troll', 5, 20, 2, 4, 0),
+]
+
+TITLE_TEMPLATES = [
+    'Slay the {enemy}',
+    'Hunt the {enemy}',
+    'Storm the {place}',
+    'Defend the {place}',
+    'Clear the {place}',
+]
+
+PLACES = ['Castle', 'Crypt', 'Mill', 'Bridge', 'Tower', 'Forest', 'Mine']
+
+class MissionView():
+    """A lazy sequence of some of the missions in a catalog."""
+
+    def __init__(self, catalog, numbers):
+        """Initialize with a catalog and a sequence of mission numbers."""
+        self.catalog = catalog
+        self.numbers = numbers
+
+    def __len__(self):
+        """Return the number of missions."""
+        return len(self.numbers)
+
+    def __getitem__(self, i):
+        """Return a mission, or a view of a slice of missions."""
+        if isinstance(i, slice):
+            return MissionView(self.catalog, self.numbers[i])
+        return self.catalog[self.numbers[i]]
+
+    def __iter__(self):
+        """Iterate over the missions."""
+        for i in self.numbers:
+            yield self.catalog[i]
+
+
+class MissionCatalog():
+    """An indexed catalog of missions.
+
+    The catalog holds only mission metadata in compact columns. A
+    Mission object, and its enemy, is created on first access. Missions
+    are indexed by difficulty, enemy type and title, so filtered lookups
+    take O(log n) plus the number of matches.
+    """
+
+    def __init__(self, enemy_templates=ENEMY_TEMPLATES):
+        """Initialize an empty catalog."""
+        self.enemy_templates = list(enemy_templates)
+        self.titles = []
+        self.enemies = array('H')
+        self.seeds = array('Q')
+        self._missions = {}
+        self._indexes = None
+
+    @classmethod
+    def generate(cls, n, rng=None, enemy_templates=ENEMY_TEMPLATES,
+                 title_templates=TITLE_TEMPLATES, places=PLACES,
+                 difficulty=None, bands=None):
+        """Generate a catalog of n random missions.
+
+        Args:
+            n: (int) Number of missions.
+            rng: (GameRandom) Random number stream for generation.
+            enemy_templates: (list) EnemyTemplates to choose enemies from.
+            title_templates: (list) Title formats with {enemy} and {place}
+                fields.
+            places: (list) Place names for titles.
+            difficulty: (DifficultyService) Optional service to aim
+                missions at win chance bands for its player. Each mission
+                picks a band at random, then an enemy in that band.
+            bands: (list) (low, high) win chance bands, default
+                difficulty.DEFAULT_BANDS.
+        """
+        rng = rng if rng is not None else GameRandom()
+        catalog = cls(enemy_templates)
+        choice = rng.choice
+        enemy_count = len(catalog.enemy_templates)
+        band_templates = None
+        if difficulty is not None:
+            if bands is None:
+                band_templates = difficulty.band_templates(
+                        catalog.enemy_templates)
+            else:
+                band_templates = difficulty.band_templates(
+                        catalog.enemy_templates, bands)
+        for i in range(n):
+            if band_templates is None:
+                enemy = rng.randrange(enemy_count)
+            else:
+                enemy = choice(choice(band_templates))
+            title = choice(title_templates).format(
+                    enemy=catalog.enemy_templates[enemy].name,
+                    place=choice(places))
+            catalog.add(title, enemy, rng.getrandbits(64))
+        return catalog
+
+    def add(self, title, enemy, seed):
+        """Add a mission.
+
+        Args:
+            title: (str) Mission title.
+            enemy: (int) Index of the enemy's template.
+            seed: (int) Seed of the mission's random number stream.
+        """
+        # Titles repeat a lot, so share one string per title.
+        self.titles.append(sys.intern(title))
+        self.enemies.append(enemy)
+        self.seeds.append(seed)
+        self._indexes = None
+
+    def __len__(self):
+        """Return the number of missions."""
+        return len(self.titles)
+
+    def __getitem__(self, i):
+        """Return mission i, creating it on first access, or a view of
+        a slice of missions."""
+        if isinstance(i, slice):
+            return MissionView(self, range(len(self))[i])
+        if i < 0:
+            i += len(self)
+        try:
+            return self._missions[i]
+        except KeyError:
+            template = self.enemy_templates[self.enemies[i]]
+            mission = Mission(self.titles[i], template.name,
+                              GameRandom(self.seeds[i]), template)
+            mission.seed = self.seeds[i]
+            self._missions[i] = mission
+            return mission
+
+    def __iter__(self):
+        """Iterate over all missions."""
+        for i in range(len(self)):
+            yield self[i]
+
+    def difficulty(self, i):
+        """Return the difficulty of mission i."""
+        return self.enemy_templates[self.enemies[i]].difficulty
+
+    def _index(self, name):
+        """Return the sorted keys and mission numbers of an index."""
+        if self._indexes is None:
+            keys = {
+                'difficulty': [self.enemy_templates[e].difficulty
+                               for e in self.enemies],
+                'enemy': [self.enemy_templates[e].name
+                          for e in self.enemies],
+                'title': self.titles,
+            }
+            self._indexes = {}
+            for index, column in keys.items():
+                order = sorted(range(len(column)), key=column.__getitem__)
+                self._indexes[index] = (
+                        [column[i] for i in order],
+                        memoryview(array('L', order)))
+        return self._indexes[name]
+
+    def _range(self, name, low, high):
+        """Return a view of missions with index keys from low to high
+        inclusive."""
+        keys, order = self._index(name)
+        start = bisect_left(keys, low)
+        end = bisect_right(keys, high)
+        return MissionView(self, order[start:end])
+
+    def with_difficulty(self, low, high=None):
+        """Return a view of missions with difficulty from low to high
+        inclusive (default exactly low)."""
+        return self._range('difficulty', low, low if high is None else high)
+
+    def with_enemy(self, name):
+        """Return a view of missions against an enemy type."""
+        return self._range('enemy', name, name)
+
+    def with_title(self, prefix):
+        """Return a view of missions whose title starts with prefix."""
+        keys, order = self._index('title')
+        start = bisect_left(keys, prefix)
+        end = bisect_left(keys, prefix + chr(sys.maxunicode))
+        return MissionView(self, order[start:end])
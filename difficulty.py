@@ -0,0 +1,91 @@
+"""Cached estimates of how hard missions are for a player."""
+
+from collections import OrderedDict
+
+from mission import combat_odds, combat_stats
+
+# Win chance bands for generated missions: hard, fair and easy.
+DEFAULT_BANDS = [(0.2, 0.5), (0.5, 0.8), (0.8, 1.0)]
+
+class DifficultyService():
+    """Win chance estimates for one player against many enemies.
+
+    Estimates are exact combat odds with both sides at full hp, as at
+    the start of a mission. They are kept in an LRU cache keyed by the
+    enemy's combat stats, and the cache is cleared whenever the player's
+    combat stats change, so a cache hit needs only two tuple builds and
+    a dict lookup.
+    """
+
+    def __init__(self, player, maxsize=1024):
+        """Initialize the service.
+
+        Args:
+            player: The player character.
+            maxsize: (int) Maximum number of cached estimates.
+        """
+        self.player = player
+        self.maxsize = maxsize
+        self.player_stats = None
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+
+    def odds(self, enemy):
+        """Return the CombatOdds of the player against an enemy.
+
+        Args:
+            enemy: The enemy character, or any object with max_hp,
+                min_damage, max_damage and retreat_ratio.
+        """
+        player_stats = combat_stats(self.player, full_hp=True)
+        if player_stats != self.player_stats:
+            self.invalidate()
+            self.player_stats = player_stats
+
+        key = combat_stats(enemy, full_hp=True)
+        try:
+            odds = self._cache[key]
+        except KeyError:
+            self.misses += 1
+            odds = combat_odds(self.player, enemy, full_hp=True)
+            self._cache[key] = odds
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        else:
+            self.hits += 1
+            self._cache.move_to_end(key)
+        return odds
+
+    def win_chance(self, enemy):
+        """Return the probability that the player beats an enemy."""
+        return self.odds(enemy).win
+
+    def invalidate(self):
+        """Forget all cached estimates."""
+        self._cache.clear()
+
+    def band_templates(self, templates, bands=DEFAULT_BANDS):
+        """Sort enemy templates into win chance bands.
+
+        Args:
+            templates: (list) Enemy templates, such as
+                catalog.EnemyTemplates.
+            bands: (list) (low, high) win chance ranges.
+
+        Returns:
+            (list) For each band, the indexes of the templates whose win
+            chance is in [low, high], or of the template closest to the
+            band if there is none.
+        """
+        chances = [self.win_chance(template) for template in templates]
+        choices = []
+        for low, high in bands:
+            matches = [i for i, chance in enumerate(chances)
+                       if low <= chance <= high]
+            if not matches:
+                middle = (low + high) / 2
+                matches = [min(range(len(chances)),
+                               key=lambda i: abs(chances[i] - middle))]
+            choices.append(matches)
+        return choices
@@ -0,0 +1,154 @@
+"""Sinks and streaming analytics for structured combat events.
+
+Mission.resolve_combat appends a HitEvent for every hit and a FightEvent
+at the end of every fight to any sink with an append method. A
+collections.deque with maxlen works as a bounded ring buffer.
+"""
+
+import sys
+import struct
+from array import array
+from collections import Counter, defaultdict, deque
+
+from mission import HitEvent, FightEvent
+from stats import Statistics
+
+def ring_buffer(size):
+    """Return a sink that keeps only the most recent events."""
+    return deque(maxlen=size)
+
+
+_CHUNK = struct.Struct('<II')
+
+class EventLog():
+    """An append-only columnar file of combat events.
+
+    Events are buffered in columns and written a chunk at a time. Chunks
+    end on fight boundaries, so every FightEvent follows its own hits.
+    """
+
+    def __init__(self, path, chunk_size=4096):
+        """Open the log for appending.
+
+        Args:
+            path: Path of the log file.
+            chunk_size: (int) Hits to buffer before writing a chunk.
+        """
+        self.file = open(path, 'ab')
+        self.chunk_size = chunk_size
+        self._clear()
+
+    def _clear(self):
+        """Empty the column buffers."""
+        self.attackers = array('B')
+        self.damages = array('i')
+        self.remaining_hps = array('i')
+        self.results = array('B')
+        self.turns = array('I')
+        self.titles = []
+
+    def append(self, event):
+        """Add an event to the log."""
+        if isinstance(event, HitEvent):
+            # The turn of a hit follows from its place in the fight.
+            self.attackers.append(event.attacker)
+            self.damages.append(event.damage)
+            self.remaining_hps.append(event.remaining_hp)
+        else:
+            self.results.append(event.result)
+            self.turns.append(event.turns)
+            self.titles.append(event.title)
+            if len(self.damages) >= self.chunk_size:
+                self.flush()
+
+    def flush(self):
+        """Write buffered fights to the file."""
+        if not self.results:
+            return
+        parts = [_CHUNK.pack(len(self.damages), len(self.results))]
+        for column in (self.attackers, self.damages, self.remaining_hps,
+                       self.results, self.turns):
+            # Columns are little-endian, like the chunk header.
+            if sys.byteorder == 'big':
+                column.byteswap()
+            parts.append(column.tobytes())
+        for title in self.titles:
+            data = title.encode('utf-8')
+            parts.append(struct.pack('<H', len(data)) + data)
+        self.file.write(b''.join(parts))
+        self.file.flush()
+        self._clear()
+
+    def close(self):
+        """Write buffered fights and close the file."""
+        self.flush()
+        self.file.close()
+
+
+def read_events(path):
+    """Stream the events of an EventLog file, one chunk in memory at a
+    time."""
+    with open(path, 'rb') as f:
+        while True:
+            header = f.read(_CHUNK.size)
+            if not header:
+                return
+            hit_count, fight_count = _CHUNK.unpack(header)
+
+            columns = []
+            for typecode, count in (('B', hit_count), ('i', hit_count),
+                                    ('i', hit_count), ('B', fight_count),
+                                    ('I', fight_count)):
+                column = array(typecode)
+                column.frombytes(f.read(count * column.itemsize))
+                if sys.byteorder == 'big':
+                    column.byteswap()
+                columns.append(column)
+            attackers, damages, remaining_hps, results, turns = columns
+
+            hit = 0
+            for fight in range(fight_count):
+                size, = struct.unpack('<H', f.read(2))
+                title = f.read(size).decode('utf-8')
+                for turn in range(turns[fight]):
+                    yield HitEvent(attackers[hit], damages[hit],
+                                   remaining_hps[hit], turn)
+                    hit += 1
+                yield FightEvent(title, results[fight], turns[fight])
+
+
+class CombatAnalytics():
+    """Running combat statistics computed from a stream of events.
+
+    Only counters are kept, never the events themselves.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.damage_histogram = Counter()
+        self.fight_lengths = Counter()
+        self.missions = defaultdict(Statistics)
+
+    def append(self, event):
+        """Add an event to the statistics."""
+        if isinstance(event, HitEvent):
+            self.damage_histogram[event.damage] += 1
+        else:
+            self.fight_lengths[event.turns] += 1
+            self.missions[event.title].update(event.result)
+
+    def extend(self, events):
+        """Add a stream of events to the statistics."""
+        for event in events:
+            self.append(event)
+
+    def win_rate(self, title):
+        """Return the share of fights won on a mission."""
+        stats = self.missions[title]
+        return stats.wins / stats.total() if stats.total() else 0.0
+
+    def mean_fight_length(self):
+        """Return the mean number of hits per fight."""
+        fights = sum(self.fight_lengths.values())
+        hits = sum(turns * n for turns, n in self.fight_lengths.items())
+        return hits / fights if fights else 0.0
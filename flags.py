@@ -1,19 +1,51 @@
 """Set up standard flags."""
 
-import argparse
 import logging
 
-def init_flags(description):
-    """Enable standard flags."""
+# Set to False to skip all per-hit combat tracing, even at debug level.
+trace_combat = True
+
+def init_flags(description, add_arguments=None):
+    """Enable standard flags.
+
+    Args:
+        description: Program description for the help text.
+        add_arguments: Optional function that adds program-specific
+            arguments to the argparse parser.
+
+    Returns:
+        The parsed arguments.
+    """
+    # Import here so that importing the simulation core stays cheap.
+    import argparse
+
     parser = argparse.ArgumentParser(description=description)
     parser.add_argument("-v", "--verbose", help="enable verbose logging",
                         action="store_true")
     parser.add_argument("--debug", help="enable debug logging",
                         action="store_true")
+    parser.add_argument("--no-combat-trace",
+                        help="disable per-hit combat tracing",
+                        action="store_true")
+    parser.add_argument("--instrument",
+                        help="time the game loop and combat and write the "
+                        "results to FILE at exit (JSON, or a cProfile dump "
+                        "if FILE ends in .prof)", metavar="FILE")
+    if add_arguments:
+        add_arguments(parser)
 
     args = parser.parse_args()
+    global trace_combat
+    trace_combat = not args.no_combat_trace
     if args.debug:
         logging.basicConfig(level=logging.DEBUG)
     elif args.verbose:
         logging.basicConfig(level=logging.INFO)
 
+    # Instrumentation costs nothing unless it is switched on.
+    if args.instrument:
+        import instrument
+        instrument.enable(args.instrument)
+
+    return args
+
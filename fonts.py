@@ -0,0 +1,25 @@
+"""Process-wide caches of fonts and rendered text."""
+
+from functools import lru_cache
+
+import pygame
+
+@lru_cache(maxsize=None)
+def get_font(name, size):
+    """Return a shared system font, loading it on first use."""
+    return pygame.font.SysFont(name, size)
+
+
+@lru_cache(maxsize=1024)
+def render_text(font, text, color, antialias=True):
+    """Render text, reusing the surface of an earlier identical render.
+
+    The surface is shared between callers, so it must not be drawn on.
+    """
+    return font.render(text, antialias, color)
+
+
+def clear():
+    """Forget cached fonts and text, e.g. after pygame.font.quit()."""
+    render_text.cache_clear()
+    get_font.cache_clear()
@@ -0,0 +1,147 @@
+"""Opt-in timing of the game loop and combat.
+
+enable() wraps the hot paths of any loaded screen and mission modules
+with timers, so nothing is wrapped and there is no overhead until it is
+called. Results are written when the program exits.
+"""
+
+import sys
+import json
+import atexit
+import cProfile
+import functools
+from time import perf_counter_ns
+
+class Timer():
+    """Call counts and durations of one timed function."""
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+        # Bucket k counts calls that took less than 2**k nanoseconds.
+        self.histogram = [0] * 64
+
+    def add(self, elapsed):
+        """Record a call that took elapsed nanoseconds."""
+        self.count += 1
+        self.total += elapsed
+        if self.min is None or elapsed < self.min:
+            self.min = elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.histogram[elapsed.bit_length()] += 1
+
+    def as_dict(self):
+        """Return the counters in microseconds for JSON output."""
+        return {
+            'count': self.count,
+            'total_us': self.total / 1e3,
+            'mean_us': self.total / self.count / 1e3 if self.count else 0,
+            'min_us': (self.min or 0) / 1e3,
+            'max_us': self.max / 1e3,
+            'histogram_us': {'<%g' % (2**k / 1e3): n
+                             for k, n in enumerate(self.histogram) if n},
+        }
+
+
+timers = {}
+_originals = []
+_profiler = None
+_enabled = False
+
+# Methods timed on every class that defines them.
+SCREEN_METHODS = ('catch_events', 'display', 'draw_objects', 'prep_objects',
+                  'bake_layer')
+MISSION_METHODS = ('resolve_combat',)
+
+def timed(name, func):
+    """Return func wrapped with the timer called name."""
+    timer = timers.setdefault(name, Timer())
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timer.add(perf_counter_ns() - start)
+    return wrapper
+
+
+def _wrap(owner, attribute, name):
+    """Replace an attribute of a class or module with a timed version."""
+    original = getattr(owner, attribute)
+    _originals.append((owner, attribute, original))
+    setattr(owner, attribute, timed(name, original))
+
+
+def _classes(base):
+    """Return a class and all of its subclasses."""
+    classes = [base]
+    for subclass in base.__subclasses__():
+        classes.extend(_classes(subclass))
+    return classes
+
+
+def enable(path):
+    """Start timing and write the results to path at exit.
+
+    A path ending in .prof gets a cProfile dump of the whole run, readable
+    with pstats. Any other path gets the timers as JSON.
+
+    Raises:
+        RuntimeError: If timing is already enabled.
+    """
+    global _profiler, _enabled
+    if _enabled:
+        raise RuntimeError("Instrumentation is already enabled.")
+    _enabled = True
+    if path.endswith('.prof'):
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    else:
+        screen = sys.modules.get('screen')
+        if screen:
+            for cls in _classes(screen.Screen):
+                for method in SCREEN_METHODS:
+                    if method in vars(cls):
+                        _wrap(cls, method, cls.__name__ + '.' + method)
+            _wrap(screen.pygame.display, 'flip', 'pygame.display.flip')
+            _wrap(screen.pygame.display, 'update', 'pygame.display.update')
+
+        mission = sys.modules.get('mission')
+        if mission:
+            for method in MISSION_METHODS:
+                _wrap(mission.Mission, method, 'Mission.' + method)
+
+    atexit.register(dump, path)
+
+
+def disable():
+    """Stop timing, restore the original functions and skip the dump at
+    exit."""
+    global _profiler, _enabled
+    atexit.unregister(dump)
+    while _originals:
+        owner, attribute, original = _originals.pop()
+        setattr(owner, attribute, original)
+    if _profiler:
+        _profiler.disable()
+        _profiler = None
+    timers.clear()
+    _enabled = False
+
+
+def dump(path):
+    """Write the results to path."""
+    if _profiler:
+        _profiler.disable()
+        _profiler.dump_stats(path)
+    else:
+        with open(path, 'w') as f:
+            json.dump({name: timer.as_dict()
+                       for name, timer in sorted(timers.items())},
+                      f, indent=2)
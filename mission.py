@@ -1,92 +1,299 @@
 """Classes for modeling combat missions."""
 
 import logging
-from random import randrange, shuffle, choice
+import math
 from itertools import cycle
+from functools import lru_cache
+from collections import namedtuple
 
 import flags
 from actor import Actor, Player
+from rng import GameRandom
 
 # "Constants" for combat result
 WIN = 0
 LOSE = 1
 RETREAT = 2
 
+# "Constants" for the side of a combatant
+PLAYER_SIDE = 0
+ENEMY_SIDE = 1
+
+# Exact combat outcome probabilities and expected remaining hp.
+CombatOdds = namedtuple(
+        'CombatOdds', ['win', 'lose', 'retreat', 'player_hp', 'enemy_hp'])
+
+# Structured combat events, see events.py for sinks and analytics.
+HitEvent = namedtuple(
+        'HitEvent', ['attacker', 'damage', 'remaining_hp', 'turn'])
+FightEvent = namedtuple('FightEvent', ['title', 'result', 'turns'])
+
 class Mission():
     """A representation of a combat mission."""
 
-    def __init__(self, title='Title', enemy_name='Enemy'):
-        """Initialize mission attributes."""
+    def __init__(self, title='Title', enemy_name='Enemy', rng=None,
+                 enemy_template=None):
+        """Initialize mission attributes.
+
+        Args:
+            title: (str) Mission title.
+            enemy_name: (str) Name of the enemy.
+            rng: (GameRandom) Random number stream for combat, default a
+                new unseeded stream.
+            enemy_template: Optional object with max_hp, min_damage,
+                max_damage and retreat_ratio attributes for the enemy,
+                such as a catalog.EnemyTemplate.
+        """
         # Set the title.
         self.title = title
+        self.rng = rng if rng is not None else GameRandom()
 
-        # Create an enemy.
-        self.enemy = Actor(enemy_name)
-        self.enemy.log_properties()
+        # The enemy is created on first access.
+        self.enemy_name = enemy_name
+        self.enemy_template = enemy_template
+        self._enemy = None
 
         # Default result is None.
         self.result = None
 
-    def resolve_combat(self, player):
+        # Seed that identifies the mission, e.g. in a catalog, if known.
+        self.seed = 0
+
+        # Replay of the last fight, if it was recorded.
+        self.replay = None
+
+    @property
+    def enemy(self):
+        """The enemy character, created on first access."""
+        if self._enemy is None:
+            self._enemy = Actor(self.enemy_name)
+            template = self.enemy_template
+            if template is not None:
+                self._enemy.max_hp = template.max_hp
+                self._enemy.min_damage = template.min_damage
+                self._enemy.max_damage = template.max_damage
+                self._enemy.retreat_ratio = template.retreat_ratio
+                self._enemy.heal()
+            if flags.trace_combat:
+                self._enemy.log_properties()
+        return self._enemy
+
+    def resolve_combat(self, player, events=None):
         """Resolve combat.
         
         Args:
             player: The player character.
+            events: Optional sink with an append method, such as a
+                collections.deque or events.CombatAnalytics, that receives
+                a HitEvent for every hit and a FightEvent at the end.
             
         Returns:
             (int) "Constants" WIN, RETREAT, or LOSE
         """
+        # Decide once whether to trace hits, not on every hit.
+        trace = (flags.trace_combat
+                 and logging.root.isEnabledFor(logging.DEBUG))
+
         # Randomize whether player or enemy hits first.
         actors = [player, self.enemy]
-        shuffle(actors)
+        self.rng.shuffle(actors)
+        rolls = [self.rng.damage_rolls(actor.min_damage, actor.max_damage)
+                 for actor in actors]
+        sides = [PLAYER_SIDE if actor is player else ENEMY_SIDE
+                 for actor in actors]
 
         # Perform combat
+        turn = 0
         for i in cycle(range(2)):
             # End combat if actor has hp less than retreat ratio
             if actors[i].hp <= actors[i].max_hp * actors[i].retreat_ratio:
                 break
-            damage = randrange(
-                    actors[i].min_damage, actors[i].max_damage + 1)
+            damage = next(rolls[i])
             actors[i-1].hp -= damage
-            logging.debug(
-                    actors[i].name + " hits for " + str(damage) + ". "
-                    + actors[i-1].name + " " + str(actors[i-1].hp)
-                    + " HP remaining.")
+            if trace:
+                logging.debug("%s hits for %d. %s %d HP remaining.",
+                              actors[i].name, damage, actors[i-1].name,
+                              actors[i-1].hp)
+            if events is not None:
+                events.append(
+                        HitEvent(sides[i], damage, actors[i-1].hp, turn))
+            turn += 1
 
-        logging.debug(player.name + ": " + str(player.hp) + "HP")
-        logging.debug(self.enemy.name + ":  " + str(self.enemy.hp) + "HP")
+        if trace:
+            logging.debug("%s: %dHP", player.name, player.hp)
+            logging.debug("%s:  %dHP", self.enemy.name, self.enemy.hp)
 
         # Report results.
         if self.enemy.hp <= 0:
-            logging.info(player.name + " won.")
+            logging.info("%s won.", player.name)
             self.result = WIN
         elif player.hp > 0:
-            logging.info(player.name + " withdrew.")
+            logging.info("%s withdrew.", player.name)
             self.result = RETREAT
         else:
             player.hp = 0
-            logging.info(player.name + " defeated.")
+            logging.info("%s defeated.", player.name)
             self.result = LOSE
 
+        if events is not None:
+            events.append(FightEvent(self.title, self.result, turn))
         return self.result
 
 
+def combat_odds(player, enemy, full_hp=False):
+    """Compute exact combat outcome probabilities.
+
+    Combat is treated as a Markov chain over (player hp, enemy hp, whose
+    turn), so the result is what Mission.resolve_combat converges to over
+    many fights. Results are cached by the stats of both actors.
+
+    Args:
+        player: The player character.
+        enemy: The enemy character.
+        full_hp: (bool) Assume both actors start with max hp, as they do
+            on a mission, instead of their current hp.
+
+    Returns:
+        (CombatOdds) Probabilities of WIN, LOSE and RETREAT and the
+        expected remaining hp (never below 0) of player and enemy.
+    """
+    return _solve_combat(combat_stats(player, full_hp),
+                         combat_stats(enemy, full_hp))
+
+
+def combat_stats(actor, full_hp=False):
+    """Return the stats of an actor that affect combat as a tuple.
+
+    With full_hp, max hp stands in for current hp, so actor can be any
+    object with max_hp, min_damage, max_damage and retreat_ratio, such
+    as a catalog.EnemyTemplate.
+    """
+    return (actor.max_hp if full_hp else actor.hp, actor.max_hp,
+            actor.min_damage, actor.max_damage, actor.retreat_ratio)
+
+
+@lru_cache(maxsize=4096)
+def _solve_combat(player_stats, enemy_stats):
+    """Solve the combat Markov chain for two stat tuples."""
+    stats = (player_stats, enemy_stats)
+    for hp, max_hp, min_damage, max_damage, retreat_ratio in stats:
+        if not 0 <= min_damage <= max_damage:
+            raise ValueError("Damage range must be non-negative.")
+    if player_stats[3] == 0 and enemy_stats[3] == 0:
+        raise ValueError("Combat never ends if neither actor deals damage.")
+
+    retreat_hp = [s[1] * s[4] for s in stats]
+    damages = [range(s[2], s[3] + 1) for s in stats]
+
+    def terminal(p, e):
+        """Return the value of a finished fight."""
+        if e <= 0:
+            return (1.0, 0.0, 0.0, max(p, 0), 0)
+        elif p > 0:
+            return (0.0, 0.0, 1.0, p, e)
+        else:
+            return (0.0, 1.0, 0.0, 0, e)
+
+    def done(p, e, turn):
+        """Return True if the actor whose turn it is ends combat."""
+        return (p, e)[turn] <= retreat_hp[turn]
+
+    def value(p, e, turn):
+        """Return the value of a state solved earlier."""
+        if done(p, e, turn):
+            return terminal(p, e)
+        return values[p, e, turn]
+
+    def expected(p, e, turn):
+        """Return the mean value over damage rolls, excluding zero
+        damage, and the probability of a zero damage roll."""
+        total = [0.0] * 5
+        for damage in damages[turn]:
+            if damage:
+                if turn == 0:
+                    state = value(p, e - damage, 1)
+                else:
+                    state = value(p - damage, e, 0)
+                total = [t + s for t, s in zip(total, state)]
+        count = len(damages[turn])
+        return ([t / count for t in total],
+                damages[turn].count(0) / count)
+
+    # Every hit lowers an hp, so states are solved from low hp upwards.
+    # A damage roll of zero only passes the turn, which is solved for
+    # both turns of the same (p, e) together.
+    lowest = [min(stats[i][0], math.floor(retreat_hp[i]))
+              - damages[1 - i].stop + 1 for i in (0, 1)]
+    values = {}
+    for p in range(lowest[0], player_stats[0] + 1):
+        for e in range(lowest[1], enemy_stats[0] + 1):
+            if done(p, e, 0) and done(p, e, 1):
+                continue
+            elif done(p, e, 1):
+                rest, zero = expected(p, e, 0)
+                after = terminal(p, e)
+                values[p, e, 0] = tuple(
+                        r + zero * a for r, a in zip(rest, after))
+            elif done(p, e, 0):
+                rest, zero = expected(p, e, 1)
+                after = terminal(p, e)
+                values[p, e, 1] = tuple(
+                        r + zero * a for r, a in zip(rest, after))
+            else:
+                rest0, zero0 = expected(p, e, 0)
+                rest1, zero1 = expected(p, e, 1)
+                scale = 1 - zero0 * zero1
+                values[p, e, 0] = tuple(
+                        (r0 + zero0 * r1) / scale
+                        for r0, r1 in zip(rest0, rest1))
+                values[p, e, 1] = tuple(
+                        (r1 + zero1 * r0) / scale
+                        for r0, r1 in zip(rest0, rest1))
+
+    # Randomize whether player or enemy hits first.
+    start = [value(player_stats[0], enemy_stats[0], turn)
+             for turn in (0, 1)]
+    return CombatOdds(*((a + b) / 2 for a, b in zip(*start)))
+
+
 class MissionList():
     """A set of runnable missions."""
 
-    def __init__(self):
-        """Initialize mission list attributes."""
+    def __init__(self, rng=None, catalog=None):
+        """Initialize mission list attributes.
+
+        Args:
+            rng: (GameRandom) Random number stream that seeds the list and
+                every mission, default a new unseeded stream.
+            catalog: (MissionCatalog) Optional catalog to offer instead of
+                the built-in missions.
+        """
+        self.rng = rng if rng is not None else GameRandom()
         self.active_mission = None
-        self.build_mission_list()
+        if catalog is not None:
+            self.missions = catalog
+        else:
+            self.build_mission_list()
 
     def build_mission_list(self):
         """Populate mission list."""
         self.missions = []
-        self.missions.append(Mission('Slay the Rat', 'Rat'))
+        self.missions.append(self.new_mission('Slay the Rat', 'Rat'))
 
         titles = ['Storm the Castle']
         enemies = ['Goblin']
-        self.missions.append(Mission(choice(titles), choice(enemies)))
+        self.missions.append(self.new_mission(self.rng.choice(titles),
+                self.rng.choice(enemies)))
+
+    def new_mission(self, title, enemy_name):
+        """Return a mission with its own stream, seeded from the list's.
+
+        The mission keeps its seed, which identifies it in replays.
+        """
+        seed = self.rng.getrandbits(64)
+        mission = Mission(title, enemy_name, GameRandom(seed))
+        mission.seed = seed
+        return mission
 
     def get_active_mission(self):
         """Return the active mission."""
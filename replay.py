@@ -0,0 +1,222 @@
+"""Compact, exact replays of resolved fights.
+
+A replay holds the starting combat stats of both sides, who hit first
+and the damage of every hit packed into one byte per hit (wider only for
+damage over 255). Since every random choice of a fight is in the
+replay, it re-runs bit for bit without a random number stream.
+"""
+
+import sys
+import struct
+from array import array
+
+from mission import (WIN, LOSE, RETREAT, PLAYER_SIDE, ENEMY_SIDE, HitEvent,
+                     combat_stats)
+
+# Seed, first side, damage typecode and hit count, then the combat stats
+# of player and enemy.
+_HEADER = struct.Struct('<QBcI')
+_STATS = struct.Struct('<iiiid')
+
+class Replay():
+    """The record of one fight."""
+
+    __slots__ = ('seed', 'first', 'player', 'enemy', 'damages')
+
+    def __init__(self, seed, first, player, enemy, damages):
+        """Initialize replay attributes.
+
+        Args:
+            seed: (int) Seed that identifies the mission, e.g. from its
+                catalog entry, or 0.
+            first: (int) PLAYER_SIDE or ENEMY_SIDE, whoever hit first.
+            player: (tuple) Player stats from mission.combat_stats.
+            enemy: (tuple) Enemy stats from mission.combat_stats.
+            damages: (array) Damage of every hit in order.
+        """
+        self.seed = seed
+        self.first = first
+        self.player = player
+        self.enemy = enemy
+        self.damages = damages
+
+    def __len__(self):
+        """Return the number of hits."""
+        return len(self.damages)
+
+    def attacker(self, turn):
+        """Return the side that hits on a turn."""
+        return self.first if turn % 2 == 0 else 1 - self.first
+
+    def hits(self):
+        """Yield a HitEvent for every hit, as the fight produced them."""
+        hp = [self.player[0], self.enemy[0]]
+        for turn, damage in enumerate(self.damages):
+            attacker = self.attacker(turn)
+            hp[1 - attacker] -= damage
+            yield HitEvent(attacker, damage, hp[1 - attacker], turn)
+
+    def seek(self, turn):
+        """Return (player hp, enemy hp) after the first turn hits.
+
+        Each side's total damage is summed over a slice of the damage
+        array, without stepping through the hits.
+        """
+        turn = min(turn, len(self.damages))
+        player_start = 0 if self.first == PLAYER_SIDE else 1
+        player_damage = sum(self.damages[player_start:turn:2])
+        enemy_damage = sum(self.damages[1 - player_start:turn:2])
+        return (self.player[0] - enemy_damage, self.enemy[0] - player_damage)
+
+    def run(self):
+        """Re-run the fight under the rules of Mission.resolve_combat.
+
+        Returns:
+            (tuple) The result, "Constants" WIN, RETREAT, or LOSE, and the
+            remaining hp of player and enemy, as the fight ended.
+
+        Raises:
+            ValueError: If the hits do not follow the rules.
+        """
+        stats = (self.player, self.enemy)
+        hp = [self.player[0], self.enemy[0]]
+
+        def done(side):
+            """Return True if side ends combat on its turn."""
+            return hp[side] <= stats[side][1] * stats[side][4]
+
+        for turn, damage in enumerate(self.damages):
+            attacker = self.attacker(turn)
+            low, high = stats[attacker][2:4]
+            if done(attacker) or not low <= damage <= high:
+                raise ValueError("Replay does not follow combat rules.")
+            hp[1 - attacker] -= damage
+        if not done(self.attacker(len(self.damages))):
+            raise ValueError("Replay ends before combat does.")
+
+        player_hp, enemy_hp = hp
+        if enemy_hp <= 0:
+            return WIN, player_hp, enemy_hp
+        elif player_hp > 0:
+            return RETREAT, player_hp, enemy_hp
+        return LOSE, 0, enemy_hp
+
+    def encode(self):
+        """Return the replay packed into bytes."""
+        damages = self.damages
+        if sys.byteorder == 'big':
+            damages = array(damages.typecode, damages)
+            damages.byteswap()
+        return b''.join([
+                _HEADER.pack(self.seed, self.first,
+                             self.damages.typecode.encode('ascii'),
+                             len(self.damages)),
+                _STATS.pack(*self.player), _STATS.pack(*self.enemy),
+                damages.tobytes()])
+
+    @classmethod
+    def decode(cls, data):
+        """Return the replay packed at the start of data and its size."""
+        seed, first, typecode, count = _HEADER.unpack_from(data, 0)
+        offset = _HEADER.size
+        player = _STATS.unpack_from(data, offset)
+        enemy = _STATS.unpack_from(data, offset + _STATS.size)
+        offset += 2 * _STATS.size
+
+        damages = array(typecode.decode('ascii'))
+        size = count * damages.itemsize
+        damages.frombytes(data[offset:offset + size])
+        if sys.byteorder == 'big':
+            damages.byteswap()
+        return cls(seed, first, player, enemy, damages), offset + size
+
+
+class ReplayRecorder():
+    """A combat event sink that records a replay of one fight.
+
+    Create it just before the fight, since it takes the starting stats
+    from the actors, and pass it to Mission.resolve_combat as events.
+    """
+
+    def __init__(self, player, enemy, seed=0):
+        """Start recording a fight between player and enemy.
+
+        Args:
+            player: The player character.
+            enemy: The enemy character.
+            seed: (int) Seed that identifies the mission, or 0.
+        """
+        self.seed = seed
+        self.player = combat_stats(player)
+        self.enemy = combat_stats(enemy)
+        self.first = None
+        self.damages = []
+        self.replay = None
+
+    def append(self, event):
+        """Record a HitEvent, or finish the replay on a FightEvent."""
+        if isinstance(event, HitEvent):
+            if self.first is None:
+                self.first = event.attacker
+            self.damages.append(event.damage)
+        else:
+            self.replay = Replay(self.seed, _first_side(
+                    self.first, self.player, self.enemy),
+                    self.player, self.enemy, _pack(self.damages))
+
+
+def _first_side(first, player, enemy):
+    """Return who hit first, or for a fight without hits, the side that
+    ended it at once."""
+    if first is not None:
+        return first
+    if player[0] <= player[1] * player[4]:
+        return PLAYER_SIDE
+    return ENEMY_SIDE
+
+
+def _pack(damages):
+    """Return damages in the narrowest array that holds them."""
+    largest = max(damages, default=0)
+    if largest < 1 << 8:
+        return array('B', damages)
+    elif largest < 1 << 16:
+        return array('H', damages)
+    return array('I', damages)
+
+
+class ReplayLog():
+    """An append-only file of replays."""
+
+    def __init__(self, path):
+        """Open the log for appending."""
+        self.file = open(path, 'ab')
+
+    def append(self, replay):
+        """Add a replay to the log and flush it to the file."""
+        self.file.write(replay.encode())
+        self.file.flush()
+
+    def close(self):
+        """Close the file."""
+        self.file.close()
+
+
+def read_replays(path):
+    """Stream the replays of a ReplayLog file, one in memory at a time.
+
+    An incomplete last replay, e.g. from a crash while appending, is
+    skipped.
+    """
+    fixed = _HEADER.size + 2 * _STATS.size
+    with open(path, 'rb') as f:
+        while True:
+            header = f.read(fixed)
+            if len(header) < fixed:
+                return
+            seed, first, typecode, count = _HEADER.unpack_from(header, 0)
+            size = count * array(typecode.decode('ascii')).itemsize
+            damages = f.read(size)
+            if len(damages) < size:
+                return
+            yield Replay.decode(header + damages)[0]
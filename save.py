@@ -0,0 +1,234 @@
+"""Save and load game state in a compact binary format.
+
+A save file starts with a magic number and format version, followed by
+records of (type, length, payload). A snapshot writes the player,
+statistics and optionally a mission catalog. Each mission result is then
+appended as a small record, so autosaving costs O(1) however large the
+snapshot is.
+"""
+
+import os
+import sys
+import mmap
+import struct
+from array import array
+
+from actor import Player
+from stats import Statistics
+from catalog import MissionCatalog, EnemyTemplate
+
+MAGIC = b'ADHP'
+VERSION = 1
+
+# Record types.
+PLAYER = 1
+STATISTICS = 2
+RESULT = 3
+CATALOG = 4
+
+_HEADER = struct.Struct('<4sH')
+_RECORD = struct.Struct('<BI')
+_ACTOR = struct.Struct('<qqqqd')
+_STATISTICS = struct.Struct('<QQQ')
+_RESULT = struct.Struct('<Bq')
+_TEMPLATE = struct.Struct('<qqqqd')
+_COUNTS = struct.Struct('<III')
+
+def _pack_str(text):
+    """Pack a string with its length."""
+    data = text.encode('utf-8')
+    return struct.pack('<H', len(data)) + data
+
+
+def _unpack_str(buffer, offset):
+    """Unpack a string packed by _pack_str, returning it and the next
+    offset."""
+    size, = struct.unpack_from('<H', buffer, offset)
+    offset += 2
+    return bytes(buffer[offset:offset + size]).decode('utf-8'), offset + size
+
+
+def _pack_player(player):
+    """Pack the name and stats of a player."""
+    return _pack_str(player.name) + _ACTOR.pack(player.hp, player.max_hp,
+            player.min_damage, player.max_damage, player.retreat_ratio)
+
+
+def _unpack_player(buffer):
+    """Unpack a player packed by _pack_player."""
+    player = Player()
+    player.name, offset = _unpack_str(buffer, 0)
+    (player.hp, player.max_hp, player.min_damage, player.max_damage,
+            player.retreat_ratio) = _ACTOR.unpack_from(buffer, offset)
+    return player
+
+
+def _pack_catalog(catalog):
+    """Pack a mission catalog as columns."""
+    # Store each distinct title once and a title number per mission.
+    title_numbers = {}
+    titles = array('I', [title_numbers.setdefault(title, len(title_numbers))
+                         for title in catalog.titles])
+
+    parts = [_COUNTS.pack(len(catalog.enemy_templates), len(title_numbers),
+                          len(catalog))]
+    for template in catalog.enemy_templates:
+        parts.append(_pack_str(template.name))
+        parts.append(_TEMPLATE.pack(template.difficulty, template.max_hp,
+                template.min_damage, template.max_damage,
+                template.retreat_ratio))
+    parts.extend(_pack_str(title) for title in title_numbers)
+    for column in (titles, catalog.enemies, catalog.seeds):
+        if sys.byteorder == 'big':
+            column = array(column.typecode, column)
+            column.byteswap()
+        parts.append(column.tobytes())
+    return b''.join(parts)
+
+
+def _unpack_catalog(buffer):
+    """Unpack a catalog packed by _pack_catalog.
+
+    Columns are copied straight from the buffer, which is a memory map
+    of the save file.
+    """
+    template_count, title_count, size = _COUNTS.unpack_from(buffer, 0)
+    offset = _COUNTS.size
+
+    templates = []
+    for i in range(template_count):
+        name, offset = _unpack_str(buffer, offset)
+        templates.append(EnemyTemplate(name,
+                *_TEMPLATE.unpack_from(buffer, offset)))
+        offset += _TEMPLATE.size
+
+    title_table = []
+    for i in range(title_count):
+        title, offset = _unpack_str(buffer, offset)
+        title_table.append(title)
+
+    catalog = MissionCatalog(templates)
+    for column, typecode in ((None, 'I'), ('enemies', 'H'),
+                             ('seeds', 'Q')):
+        values = array(typecode)
+        end = offset + size * values.itemsize
+        values.frombytes(buffer[offset:end])
+        if sys.byteorder == 'big':
+            values.byteswap()
+        offset = end
+        if column is None:
+            catalog.titles = [title_table[i] for i in values]
+        else:
+            setattr(catalog, column, values)
+    return catalog
+
+
+class SaveFile():
+    """A save file for one game."""
+
+    def __init__(self, path):
+        """Initialize save file attributes."""
+        self.path = path
+        self._append_file = None
+
+    def exists(self):
+        """Return True if the save file exists."""
+        return os.path.exists(self.path)
+
+    def save(self, player, stats, catalog=None):
+        """Write a snapshot of the game, replacing earlier saves.
+
+        Args:
+            player: The player character.
+            stats: (Statistics) Mission results so far.
+            catalog: (MissionCatalog) Optional missions to save.
+        """
+        self.close()
+        stats = stats.snapshot()
+        records = [(PLAYER, _pack_player(player)),
+                   (STATISTICS, _STATISTICS.pack(
+                       stats.wins, stats.losses, stats.retreats))]
+        if catalog is not None:
+            records.append((CATALOG, _pack_catalog(catalog)))
+
+        # Write a new file and swap it in, so a crash keeps the old save.
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION))
+            for record_type, payload in records:
+                f.write(_RECORD.pack(record_type, len(payload)))
+                f.write(payload)
+        os.replace(temp_path, self.path)
+
+    def append_result(self, result, player_hp):
+        """Append one mission result to the save file.
+
+        Args:
+            result: (int) "Constants" WIN, RETREAT, or LOSE.
+            player_hp: (int) Player hp after the mission.
+        """
+        if self._append_file is None:
+            self._append_file = open(self.path, 'ab')
+        payload = _RESULT.pack(result, player_hp)
+        self._append_file.write(_RECORD.pack(RESULT, len(payload)) + payload)
+        self._append_file.flush()
+
+    def load(self):
+        """Load the game.
+
+        Returns:
+            (tuple) Player, Statistics and MissionCatalog (None if no
+            catalog was saved).
+        """
+        self.close()
+        player = Player()
+        stats = Statistics()
+        catalog = None
+
+        with open(self.path, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            view = memoryview(data)
+            try:
+                if len(view) < _HEADER.size:
+                    raise ValueError("Not a save file: " + self.path)
+                magic, version = _HEADER.unpack_from(view, 0)
+                if magic != MAGIC:
+                    raise ValueError("Not a save file: " + self.path)
+                if version != VERSION:
+                    raise ValueError("Unsupported save file version: "
+                                     + str(version))
+
+                offset = _HEADER.size
+                while offset + _RECORD.size <= len(view):
+                    record_type, size = _RECORD.unpack_from(view, offset)
+                    offset += _RECORD.size
+                    # A crash while appending can leave the last record
+                    # incomplete. Keep the game as it was before it.
+                    if offset + size > len(view):
+                        break
+                    payload = view[offset:offset + size]
+                    offset += size
+
+                    try:
+                        if record_type == PLAYER:
+                            player = _unpack_player(payload)
+                        elif record_type == STATISTICS:
+                            (stats.wins, stats.losses,
+                                stats.retreats) = _STATISTICS.unpack(payload)
+                        elif record_type == RESULT:
+                            result, player.hp = _RESULT.unpack(payload)
+                            stats.update(result)
+                        elif record_type == CATALOG:
+                            catalog = _unpack_catalog(payload)
+                    finally:
+                        payload.release()
+            finally:
+                view.release()
+
+        return player, stats, catalog
+
+    def close(self):
+        """Close the file used for appending results."""
+        if self._append_file is not None:
+            self._append_file.close()
+            self._append_file = None
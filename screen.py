@@ -1,13 +1,25 @@
 """Classes for modeling game screens."""
 
 import sys
+import asyncio
+# Screens import pygame up front. The simulation core (actor, mission,
+# stats, balance, simulate) must not import this module or fonts.
 import pygame
 import re
 import mission
+import fonts
+from replay import ReplayRecorder
 
 class Screen():
     """A representation of a game screen."""
 
+    # Optional object whose events(screen) method supplies input in place
+    # of the pygame event queue, e.g. to replay a recorded session.
+    event_source = None
+
+    # Set to False to skip drawing, e.g. when fast-forwarding sessions.
+    rendering = True
+
     def __init__(self, bg):
         """Initialize screen attributes."""
         self.bg = bg
@@ -15,9 +27,23 @@ class Screen():
 
         self.text_color = (0, 0, 0)
         self.alt_text_color = (100, 100, 100)
-        self.title_font = pygame.font.SysFont(None, 42)
-        self.basic_font = pygame.font.SysFont(None, 36)
-        self.alt_font = pygame.font.SysFont(None, 32)
+        self.title_font = fonts.get_font(None, 42)
+        self.basic_font = fonts.get_font(None, 36)
+        self.alt_font = fonts.get_font(None, 32)
+
+        # Cap the frame rate and wake up at least once a second when idle.
+        self.fps = 30
+        self.idle_timeout = 1000
+        self.clock = pygame.time.Clock()
+
+        # Regions of bg.surface that need to be made visible.
+        self.full_redraw = True
+        self.dirty_rects = []
+
+        # Static objects are baked into this surface on first display,
+        # and regions of it are rebaked when their objects change.
+        self.layer = None
+        self.stale_rects = []
 
         # Render fixed objects.
         self.prep_objects()
@@ -29,30 +55,123 @@ class Screen():
         """Run the screen's game loop."""
         # Make the screen state active.
         self.active = True
+        self.mark_dirty()
 
         while self.active:
             # Check for events.
             self.catch_events()
+            if not self.rendering:
+                continue
+
+            # Draw the screen only if something changed.
+            if self.full_redraw or self.dirty_rects:
+                self.display()
+
+            # Limit the frame rate.
+            self.clock.tick(self.fps)
+
+    async def run_async(self):
+        """Run the screen's game loop as a coroutine.
+
+        Events are polled once a frame and the loop sleeps between
+        frames, so other tasks keep running while the screen is shown.
+        """
+        self.active = True
+        self.mark_dirty()
+        loop = asyncio.get_running_loop()
 
-            # Draw the screen.
-            self.display()
+        while self.active:
+            start = loop.time()
+            self.catch_events(wait=False)
+            if not self.rendering:
+                await asyncio.sleep(0)
+                continue
+
+            if self.full_redraw or self.dirty_rects:
+                self.display()
+
+            # Sleep for the rest of the frame.
+            await asyncio.sleep(max(0, 1 / self.fps - (loop.time() - start)))
+
+    def mark_dirty(self, rect=None):
+        """Mark a region (default the whole screen) for redrawing."""
+        if rect is None:
+            self.full_redraw = True
+        else:
+            self.dirty_rects.append(pygame.Rect(rect))
+
+    def reset(self):
+        """Overridable function for re-arming the screen with new data.
+
+        Subclasses take the same arguments as their constructor, minus
+        bg, and re-prepare only the objects whose data changed.
+        """
+        pass
+
+    def invalidate_layer(self, rect=None):
+        """Rebake a region (default all) of the static layer before the
+        next frame and redraw it."""
+        self.stale_rects.append(None if rect is None else pygame.Rect(rect))
+        self.mark_dirty(rect)
+
+    def bake_layer(self, rect=None):
+        """Draw the background color and static objects into a region
+        (default all) of the static layer."""
+        if self.layer is None:
+            # Match the display's pixel format, as convert() would.
+            self.layer = pygame.Surface(self.bg_rect.size, 0,
+                                        self.bg.surface)
+            rect = None
+        self.layer.set_clip(rect)
+        self.layer.fill(self.bg.color)
+        self.draw_static(self.layer)
+        self.layer.set_clip(None)
 
     def display(self):
         """Draw and display the screen."""
-        # Fill background color.
-        self.bg.surface.fill(self.bg.color)
+        if self.layer is None:
+            self.bake_layer()
+        else:
+            for rect in self.stale_rects:
+                self.bake_layer(rect)
+        self.stale_rects = []
 
-        # Draw objects.
+        # Restore the static layer, then draw dynamic objects over it.
+        if self.full_redraw:
+            self.bg.surface.blit(self.layer, (0, 0))
+        else:
+            for rect in self.dirty_rects:
+                self.bg.surface.blit(self.layer, rect, rect)
         self.draw_objects()
 
-        # Make the most recently drawn bg.surface visible.
-        pygame.display.flip()
+        # Make the changed parts of bg.surface visible.
+        if self.full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.dirty_rects)
+        self.full_redraw = False
+        self.dirty_rects = []
+
+    def catch_events(self, wait=True):
+        """Catch common events and include events for specific screens.
+
+        Args:
+            wait: (bool) Sleep until an event arrives if none are queued.
+        """
+        if self.event_source:
+            events = self.event_source.events(self)
+        elif wait:
+            # Sleep until an event arrives, then take any that queued up.
+            events = [pygame.event.wait(self.idle_timeout)]
+            events.extend(pygame.event.get())
+        else:
+            events = pygame.event.get()
 
-    def catch_events(self):
-        """Catch common events and include events for specific screens."""
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 sys.exit()
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.mark_dirty()
             else:
                 self.catch_special_events(event)
 
@@ -65,8 +184,14 @@ class Screen():
         """Overridable function for screen-specific events."""
         pass
 
+    def draw_static(self, surface):
+        """Overridable function for drawing screen-specific objects that
+        only change with prep_objects onto the static layer."""
+        pass
+
     def draw_objects(self):
-        """Overridable function for drawing screen-specific objects."""
+        """Overridable function for drawing screen-specific objects that
+        change between frames."""
         pass
 
     def prep_objects(self):
@@ -83,30 +208,37 @@ class PlayerNameScreen(Screen):
         self.player = player
         self.name_input = ''
 
+    def reset(self, player):
+        """Re-arm the screen to name another player."""
+        self.player = player
+        self.name_input = ''
+
     def catch_special_events(self, event):
         """Catch screen-specific events."""
         if event.type == pygame.KEYDOWN:
             # If a "word" character, append to input
             if re.match(r'\w', event.unicode):
                 self.name_input += event.unicode
+                self.mark_dirty(self.name_input_area)
             # Backspace deletes the last letter
             elif event.key == pygame.K_BACKSPACE:
                 self.name_input = self.name_input[:-1]
+                self.mark_dirty(self.name_input_area)
             # Return ends name input and creates player
             elif event.key == pygame.K_RETURN:
                 self.player.name = self.name_input
                 self.player.log_properties()
                 self.active = False
 
+    def draw_static(self, surface):
+        """Draw the name prompt."""
+        surface.blit(self.name_prompt_image, self.name_prompt_rect)
+
     def draw_objects(self):
         """Draw screen objects."""
-        # Draw name prompt.
-        self.bg.surface.blit(
-                self.name_prompt_image, self.name_prompt_rect)
-
         # Render name input and position right of center on bg.surface.
-        name_input_image = self.basic_font.render(
-                self.name_input, True, self.text_color)
+        name_input_image = fonts.render_text(self.basic_font,
+                self.name_input, self.text_color)
         name_input_rect = name_input_image.get_rect()
         name_input_rect.left = self.bg_rect.centerx + 10
         name_input_rect.centery = self.bg_rect.centery
@@ -119,11 +251,18 @@ class PlayerNameScreen(Screen):
         self.name_prompt = "Name your character:"
 
         # Render name prompt and position left of center on bg.surface.
-        self.name_prompt_image = self.basic_font.render(self.name_prompt, True, self.text_color)
+        self.name_prompt_image = fonts.render_text(
+                self.basic_font, self.name_prompt, self.text_color)
         self.name_prompt_rect = self.name_prompt_image.get_rect()
         self.name_prompt_rect.right = self.bg_rect.centerx - 10
         self.name_prompt_rect.centery = self.bg_rect.centery
 
+        # Name input is redrawn in the line right of center.
+        self.name_input_area = pygame.Rect(
+                self.bg_rect.centerx, 0, self.bg_rect.width
+                - self.bg_rect.centerx, self.basic_font.get_linesize())
+        self.name_input_area.centery = self.bg_rect.centery
+
 
 class CharacterScreen(Screen):
     """The character management screen."""
@@ -133,42 +272,56 @@ class CharacterScreen(Screen):
         self.player = player
         super().__init__(bg)
 
+    def reset(self, player):
+        """Re-arm the screen, re-rendering stats only if they changed."""
+        self.player = player
+        if self.shown_stats != self.player_stats():
+            self.prep_objects()
+            self.invalidate_layer()
+
+    def player_stats(self):
+        """Return the player stats shown on the screen."""
+        return (self.player.name, self.player.max_hp,
+                self.player.min_damage, self.player.max_damage)
+
     def catch_special_events(self, event):
         """Catch screen-specific events."""
         if event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_position = pygame.mouse.get_pos()
+            mouse_position = event.pos
             if self.inst_rect.collidepoint(mouse_position):
                 self.active = False
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 self.active = False
 
-    def draw_objects(self):
-        """Draw the prompt for game readiness."""
-        self.bg.surface.blit(self.name_image, self.name_rect)
-        self.bg.surface.blit(self.hp_image, self.hp_rect)
-        self.bg.surface.blit(self.damage_image, self.damage_rect)
-        self.bg.surface.blit(self.inst_image, self.inst_rect)
+    def draw_static(self, surface):
+        """Draw the character's stats."""
+        surface.blit(self.name_image, self.name_rect)
+        surface.blit(self.hp_image, self.hp_rect)
+        surface.blit(self.damage_image, self.damage_rect)
+        surface.blit(self.inst_image, self.inst_rect)
 
     def prep_objects(self):
         """Prepare fixed objects for drawing to the screen."""
+        self.shown_stats = self.player_stats()
+
         # Render player max HP at the center of the screen.
-        self.hp_image = self.basic_font.render("HP: " +
-                str(self.player.max_hp), True, self.text_color)
+        self.hp_image = fonts.render_text(self.basic_font, "HP: " +
+                str(self.player.max_hp), self.text_color)
         self.hp_rect = self.hp_image.get_rect()
         self.hp_rect.center = self.bg_rect.center
 
         # Render player name above HP.
-        self.name_image = self.title_font.render(self.player.name, True,
-                self.text_color)
+        self.name_image = fonts.render_text(self.title_font,
+                self.player.name, self.text_color)
         self.name_rect = self.name_image.get_rect()
         self.name_rect.centerx = self.bg_rect.centerx
         self.name_rect.bottom = self.hp_rect.top - 5
 
         # Render player damage below HP.
-        self.damage_image = self.basic_font.render("Damage: " +
+        self.damage_image = fonts.render_text(self.basic_font, "Damage: " +
                 str(self.player.min_damage) + "-" +
-                str(self.player.max_damage), True, self.text_color)
+                str(self.player.max_damage), self.text_color)
         self.damage_rect = self.damage_image.get_rect()
         self.damage_rect.centerx = self.bg_rect.centerx
         self.damage_rect.top = self.hp_rect.bottom + 5
@@ -176,8 +329,8 @@ class CharacterScreen(Screen):
         # Render instruction and position at the center bottom of
         # bg.surface.
         inst_msg = "Press ESCAPE to return"
-        self.inst_image = self.alt_font.render(
-                inst_msg, True, self.alt_text_color)
+        self.inst_image = fonts.render_text(self.alt_font,
+                inst_msg, self.alt_text_color)
         self.inst_rect = self.inst_image.get_rect()
         self.inst_rect.centerx = self.bg_rect.centerx
         self.inst_rect.bottom = self.bg_rect.bottom - 10
@@ -189,132 +342,240 @@ class ReadyScreen(Screen):
     def __init__(self, bg, player):
         """Initialize screen attributes."""
         self.player = player
+        self.character_screen = None
         super().__init__(bg)
 
+    def reset(self, player):
+        """Re-arm the screen for a player."""
+        self.player = player
+
     def catch_special_events(self, event):
         """Catch screen-specific events."""
         if event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_position = pygame.mouse.get_pos()
+            mouse_position = event.pos
             if self.char_rect.collidepoint(mouse_position):
-                CharacterScreen(self.bg, self.player).run()
+                # Keep the character screen for the next click.
+                if self.character_screen is None:
+                    self.character_screen = CharacterScreen(
+                            self.bg, self.player)
+                else:
+                    self.character_screen.reset(self.player)
+                self.character_screen.run()
+                self.mark_dirty()
             elif self.inst_rect.collidepoint(mouse_position):
                 self.active = False
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_SPACE:
                 self.active = False
 
-    def draw_objects(self):
+    def draw_static(self, surface):
         """Draw the prompt for game readiness."""
-        self.bg.surface.blit(self.ready_image, self.ready_rect)
-        self.bg.surface.blit(self.inst_image, self.inst_rect)
-        self.bg.surface.blit(self.char_image, self.char_rect)
+        surface.blit(self.ready_image, self.ready_rect)
+        surface.blit(self.inst_image, self.inst_rect)
+        surface.blit(self.char_image, self.char_rect)
 
     def prep_objects(self):
         """Prepare fixed objects for drawing to the screen."""
         # Render question and position in the center of bg.surface.
         ready_msg = "Are you ready to adventure?"
-        self.ready_image = self.basic_font.render(
-                ready_msg, True, self.text_color)
+        self.ready_image = fonts.render_text(self.basic_font,
+                ready_msg, self.text_color)
         self.ready_rect = self.ready_image.get_rect()
         self.ready_rect.center = self.bg_rect.center
 
         # Render instruction and position at the center bottom of
         # bg.surface.
         inst_msg = "Press SPACE to continue"
-        self.inst_image = self.alt_font.render(
-                inst_msg, True, self.alt_text_color)
+        self.inst_image = fonts.render_text(self.alt_font,
+                inst_msg, self.alt_text_color)
         self.inst_rect = self.inst_image.get_rect()
         self.inst_rect.centerx = self.bg_rect.centerx
         self.inst_rect.bottom = self.bg_rect.bottom - 10
 
         # Render Character screen button
         char_msg = "Character"
-        self.char_image = self.alt_font.render(
-                char_msg, True, self.alt_text_color)
+        self.char_image = fonts.render_text(self.alt_font,
+                char_msg, self.alt_text_color)
         self.char_rect = self.char_image.get_rect()
         self.char_rect.top = 10
         self.char_rect.right = self.bg_rect.right - 10
 
 
 class AdventureMenuScreen(Screen):
-    """The "choose an adventure" screen."""
+    """The "choose an adventure" screen.
 
-    def __init__(self, bg, mission_list):
-        """Initialize screen attributes."""
+    Only the rows of the mission list that fit on the screen are
+    rendered, and the list scrolls with the mouse wheel and arrow keys.
+    """
+
+    def __init__(self, bg, mission_list, difficulty=None):
+        """Initialize screen attributes.
+
+        Args:
+            bg: The background surface.
+            mission_list: (MissionList) Missions to choose from.
+            difficulty: (DifficultyService) Optional service to show the
+                player's win chance for each mission.
+        """
         self.mission_list = mission_list
+        self.difficulty = difficulty
+        self.first_row = 0
+        self.rows = []
         super().__init__(bg)
 
+    def reset(self, mission_list, difficulty=None):
+        """Re-arm the menu, re-rendering rows only if the missions or
+        the odds shown for them changed."""
+        missions = mission_list.missions
+        if (mission_list is not self.mission_list
+                or missions is not self.missions):
+            self.mission_list = mission_list
+            self.difficulty = difficulty
+            self.first_row = 0
+            self.prep_objects()
+            self.invalidate_layer()
+        elif (difficulty is not self.difficulty
+                or self.odds_stats != self.difficulty_stats()):
+            self.difficulty = difficulty
+            self.rows = []
+            self.prep_rows()
+            self.invalidate_layer(self.rows_rect)
+
+    def difficulty_stats(self):
+        """Return the player stats that the shown odds depend on."""
+        if self.difficulty is None:
+            return None
+        return mission.combat_stats(self.difficulty.player, full_hp=True)
+
     def catch_special_events(self, event):
         """Catch screen-specific events."""
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_position = pygame.mouse.get_pos()
-            for title_msg in self.title_msgs:
-                rect = pygame.Rect(
-                        (title_msg['rect'].x + self.menu_surface_rect.x,
-                            title_msg['rect'].y + self.menu_surface_rect.y),
-                        (title_msg['rect'].width,
-                            title_msg['rect'].height))
-                if rect.collidepoint(mouse_position):
-                    self.mission_list.set_active_mission(title_msg['mission'])
-                    self.active = False
-
-    def draw_objects(self):
-        """Draw screen objects."""
-        # Fill background color
-        self.menu_surface.fill(self.bg.color)
-
-        # Draw to menu_surface
-        self.menu_surface.blit(self.heading_image, (0,0))
-        for title_msg in self.title_msgs:
-            self.menu_surface.blit(title_msg['image'],
-                    title_msg['rect'])
-
-        # Draw menu to bg.surface
-        self.bg.surface.blit(self.menu_surface, self.menu_surface_rect)
+        # Buttons 4 and 5 are the mouse wheel.
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button <= 3:
+            mission = self.mission_at(event.pos)
+            if mission is not None:
+                self.mission_list.set_active_mission(mission)
+                self.active = False
+        elif event.type == pygame.MOUSEWHEEL:
+            self.scroll(-event.y)
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_UP:
+                self.scroll(-1)
+            elif event.key == pygame.K_DOWN:
+                self.scroll(1)
+            elif event.key == pygame.K_PAGEUP:
+                self.scroll(-self.visible_rows)
+            elif event.key == pygame.K_PAGEDOWN:
+                self.scroll(self.visible_rows)
+
+    def scroll(self, rows):
+        """Scroll the mission list by a number of rows."""
+        last_row = len(self.mission_list.missions) - self.visible_rows
+        first_row = max(0, min(self.first_row + rows, last_row))
+        if first_row != self.first_row:
+            self.first_row = first_row
+            self.prep_rows()
+            self.invalidate_layer(self.rows_rect)
+
+    def mission_at(self, position):
+        """Return the mission whose title is at a position, or None."""
+        # Rows have a fixed height, so the row follows from y directly.
+        row = (position[1] - self.rows_rect.top) // self.row_height
+        if 0 <= row < len(self.rows):
+            if self.rows[row]['rect'].collidepoint(position):
+                return self.rows[row]['mission']
+        return None
+
+    def draw_static(self, surface):
+        """Draw the heading and visible rows."""
+        surface.blit(self.heading_image, self.heading_rect)
+        for row in self.rows:
+            surface.blit(row['image'], row['rect'])
 
     def prep_objects(self):
         """Prepare fixed objects for drawing to the screen."""
         heading_msg = "Choose an Adventure"
 
         # Render heading_msg
-        self.heading_image = self.title_font.render(
-                heading_msg, True, self.text_color)
-        heading_rect = self.heading_image.get_rect()
-
-        # Grab bottom position of the heading for spacing next list entry
-        last_msg_bottom = heading_rect.bottom + 5
-
-        # Render mission titles in list
-        self.title_msgs = []
-        for mission in self.mission_list.missions:
-            title_msg = mission.title
-
-            # Render title_msg and position centered below last line
-            title_image = self.basic_font.render(
-                    title_msg, True, self.text_color)
-            title_rect = title_image.get_rect()
-            title_rect.centerx = heading_rect.centerx
-            title_rect.top = last_msg_bottom + 5
-            self.title_msgs.append(
-                    {'mission': mission,
-                        'image': title_image, 'rect': title_rect})
-
-            last_msg_bottom = title_rect.bottom
-
-        # Create surface with width from heading and height from last msg.
-        # This assumes that heading is always the longest string.
-        self.menu_surface = pygame.Surface((heading_rect.width,
-                                 last_msg_bottom))
-        self.menu_surface_rect = self.menu_surface.get_rect()
-        self.menu_surface_rect.center = self.bg_rect.center
+        self.heading_image = fonts.render_text(self.title_font,
+                heading_msg, self.text_color)
+        self.heading_rect = self.heading_image.get_rect()
+
+        # Show as many rows as fit below the heading.
+        self.row_height = self.basic_font.get_height() + 5
+        room = self.bg_rect.height - 20 - self.heading_rect.height - 5
+        self.visible_rows = min(len(self.mission_list.missions),
+                                room // self.row_height)
+        self.first_row = max(0, min(self.first_row,
+                len(self.mission_list.missions) - self.visible_rows))
+
+        # Center the heading and rows vertically on bg.surface.
+        menu_height = (self.heading_rect.height + 5
+                       + self.visible_rows * self.row_height)
+        self.heading_rect.centerx = self.bg_rect.centerx
+        self.heading_rect.top = self.bg_rect.centery - menu_height // 2
+        self.rows_rect = pygame.Rect(0, self.heading_rect.bottom + 10,
+                self.bg_rect.width, self.visible_rows * self.row_height)
+
+        self.rows = []
+        self.prep_rows()
+
+    def prep_rows(self):
+        """Render the visible rows, reusing rows that stay visible."""
+        old_rows = {row['index']: row for row in self.rows}
+        missions = self.missions = self.mission_list.missions
+        self.odds_stats = self.difficulty_stats()
+
+        self.rows = []
+        for row in range(self.visible_rows):
+            index = self.first_row + row
+            title_msg = old_rows.get(index)
+            if title_msg is None:
+                mission = missions[index]
+                text = mission.title
+                if self.difficulty is not None:
+                    win = self.difficulty.win_chance(mission.enemy)
+                    text += " (" + str(round(win * 100)) + "% win)"
+                title_msg = {'index': index, 'mission': mission,
+                        'image': fonts.render_text(self.basic_font,
+                            text, self.text_color)}
+
+            # Position title centered in its row
+            title_msg['rect'] = title_msg['image'].get_rect()
+            title_msg['rect'].centerx = self.rows_rect.centerx
+            title_msg['rect'].top = self.rows_rect.top + row * self.row_height
+            self.rows.append(title_msg)
 
 
 class AdventureResultScreen(Screen):
     """The adventure result screen."""
 
-    def __init__(self, bg, stats, player, mission):
-        """Initialize screen attributes."""
+    # Optional replay.ReplayLog that receives a replay of every fight.
+    replay_log = None
+
+    def __init__(self, bg, stats, player, mission, resolve=True):
+        """Initialize screen attributes.
+
+        Args:
+            bg: The background surface.
+            stats: (Statistics) Mission results, or a ShardedStatistics.
+            player: The player character.
+            mission: The chosen mission.
+            resolve: (bool) Resolve combat now. Otherwise run_async
+                resolves it in an executor while showing "Resolving...".
+        """
+        self.start_mission(stats, player, mission, resolve)
+        super().__init__(bg)
+
+    def reset(self, stats, player, mission, resolve=True):
+        """Re-arm the screen for another mission."""
+        self.start_mission(stats, player, mission, resolve)
+        self.prep_objects()
+        self.invalidate_layer()
+
+    def start_mission(self, stats, player, mission, resolve):
+        """Heal both sides and resolve combat unless deferred."""
         self.stats = stats
+        self.stats_view = StatisticsView(stats)
         self.player = player
         self.mission = mission
 
@@ -323,26 +584,68 @@ class AdventureResultScreen(Screen):
         self.mission.enemy.heal()
 
         # Resolve combat result.
-        self.mission.resolve_combat(player)
+        self.resolving = not resolve
+        if resolve:
+            self.resolve()
+
+    def resolve(self):
+        """Resolve combat and record the result and a replay."""
+        recorder = ReplayRecorder(self.player, self.mission.enemy,
+                                  self.mission.seed)
+        self.mission.resolve_combat(self.player, recorder)
+        self.mission.replay = recorder.replay
+        if self.replay_log is not None:
+            self.replay_log.append(recorder.replay)
         self.stats.update(self.mission.result)
 
-        super().__init__(bg)
+    async def run_async(self):
+        """Resolve combat in an executor while running the screen.
+
+        Raises:
+            Any exception raised while resolving combat.
+        """
+        if not self.resolving:
+            await super().run_async()
+            return
+        future = asyncio.get_running_loop().run_in_executor(
+                None, self.resolve)
+        future.add_done_callback(self.resolved)
+        await super().run_async()
+        # Re-raise a failure to resolve combat.
+        await future
+
+    def resolved(self, future):
+        """Show the result once combat is resolved, or stop the screen
+        if resolving failed."""
+        if future.cancelled() or future.exception() is not None:
+            self.active = False
+            return
+        self.resolving = False
+        self.prep_objects()
+        self.invalidate_layer()
 
     def catch_special_events(self, event):
         """Catch screen-specific events."""
-        self.press_any_key(event)
+        if not self.resolving:
+            self.press_any_key(event)
 
-    def draw_objects(self):
-        """Draw screen objects."""
-        self.bg.surface.blit(self.title_image, self.title_rect)
-        self.bg.surface.blit(self.result_image, self.result_rect)
-        self.bg.surface.blit(self.hp_image, self.hp_rect)
+    def draw_static(self, surface):
+        """Draw the mission title and result."""
+        surface.blit(self.title_image, self.title_rect)
+        surface.blit(self.result_image, self.result_rect)
+        if not self.resolving:
+            surface.blit(self.hp_image, self.hp_rect)
 
-        self.stats.draw(self.bg)
+    def draw_objects(self):
+        """Draw the statistics overlay."""
+        if not self.resolving:
+            self.stats_view.draw(self.bg.surface)
 
     def prep_objects(self):
         """Prepare fixed objects for drawing to the screen."""
-        if self.mission.result == mission.WIN:
+        if self.resolving:
+            result_msg = "Resolving..."
+        elif self.mission.result == mission.WIN:
             result_msg = "Success! " + self.player.name + " won."
         elif self.mission.result == mission.RETREAT:
             result_msg = self.player.name + " withdrew."
@@ -352,23 +655,127 @@ class AdventureResultScreen(Screen):
         hp_msg = self.player.name + " HP: " + str(self.player.hp)
 
         # Render mission title and position slightly above center on bg.surface.
-        self.title_image = self.title_font.render(
-                self.mission.title, True, self.text_color)
+        self.title_image = fonts.render_text(self.title_font,
+                self.mission.title, self.text_color)
         self.title_rect = self.title_image.get_rect()
         self.title_rect.centerx = self.bg_rect.centerx
         self.title_rect.bottom = self.bg_rect.centery - 5
 
         # Render result_msg and position slightly below center on bg.surface.
-        self.result_image = self.basic_font.render(
-                result_msg, True, self.text_color)
+        self.result_image = fonts.render_text(self.basic_font,
+                result_msg, self.text_color)
         self.result_rect = self.result_image.get_rect()
         self.result_rect.centerx = self.bg_rect.centerx
         self.result_rect.top = self.bg_rect.centery + 5
 
         # Render hp_msg and position below result_msg on bg.surface.
-        self.hp_image = self.basic_font.render(
-                hp_msg, True, self.text_color)
+        self.hp_image = fonts.render_text(self.basic_font,
+                hp_msg, self.text_color)
         self.hp_rect = self.hp_image.get_rect()
         self.hp_rect.centerx = self.bg_rect.centerx
         self.hp_rect.top = self.result_rect.bottom + 5
 
+
+class WaitScreen(Screen):
+    """A screen shown while work finishes in the background."""
+
+    def __init__(self, bg, message, future):
+        """Initialize screen attributes.
+
+        Args:
+            bg: The background surface.
+            message: (str) What is being waited for.
+            future: The asyncio future of the work.
+        """
+        self.message = message
+        self.future = future
+        super().__init__(bg)
+
+    def reset(self, message, future):
+        """Re-arm the screen to wait for other work."""
+        self.future = future
+        if message != self.message:
+            self.message = message
+            self.prep_objects()
+            self.invalidate_layer()
+
+    async def run_async(self):
+        """Show the screen until the future is done."""
+        if not self.future.done():
+            self.future.add_done_callback(self.finished)
+            await super().run_async()
+
+    def finished(self, future):
+        """Close the screen once the work is done."""
+        self.active = False
+
+    def draw_static(self, surface):
+        """Draw the message."""
+        surface.blit(self.message_image, self.message_rect)
+
+    def prep_objects(self):
+        """Prepare fixed objects for drawing to the screen."""
+        # Render message and position in the center of bg.surface.
+        self.message_image = fonts.render_text(self.basic_font,
+                self.message, self.text_color)
+        self.message_rect = self.message_image.get_rect()
+        self.message_rect.center = self.bg_rect.center
+
+
+class StatisticsView():
+    """Draws running statistics of wins and losses."""
+
+    def __init__(self, stats):
+        """Initialize the view.
+
+        Args:
+            stats: Statistics or ShardedStatistics to show.
+        """
+        self.stats = stats
+        self.text_color = (100, 100, 100)
+        self.font = fonts.get_font(None, 32)
+
+    def draw(self, surface):
+        """Draw a snapshot of the statistics in the upper left corner."""
+        stats = self.stats.snapshot()
+        top = 10
+        for label, count in (("Wins: ", stats.wins),
+                             ("Losses: ", stats.losses),
+                             ("Retreats: ", stats.retreats)):
+            # Render each line and position it below the last one.
+            image = fonts.render_text(self.font, label + str(count),
+                                      self.text_color)
+            rect = image.get_rect()
+            rect.top = top
+            rect.left = 10
+            surface.blit(image, rect)
+            top = rect.bottom + 5
+
+
+class ScreenManager():
+    """Keeps one instance of each screen class alive between uses.
+
+    The first request for a class constructs the screen, and later ones
+    re-arm it with reset, so fonts, rendered text and the static layer
+    are reused across transitions.
+    """
+
+    def __init__(self, bg):
+        """Initialize an empty pool of screens."""
+        self.bg = bg
+        self.screens = {}
+
+    def get(self, screen_class, *args, **kwargs):
+        """Return the screen of a class, armed with the given arguments.
+
+        Args:
+            screen_class: A Screen subclass.
+            args, kwargs: Arguments for its constructor, minus bg.
+        """
+        screen = self.screens.get(screen_class)
+        if screen is None:
+            screen = screen_class(self.bg, *args, **kwargs)
+            self.screens[screen_class] = screen
+        else:
+            screen.reset(*args, **kwargs)
+        return screen
@@ -0,0 +1,208 @@
+"""Replay and fast-forward complete game sessions without a display."""
+
+import json
+import random
+import logging
+from time import perf_counter
+
+import pygame
+
+import flags
+import screen
+from adhop import play
+from actor import Player
+from background import Background
+from mission import MissionList
+from rng import GameRandom
+from stats import Statistics
+
+class SessionOver(Exception):
+    """Raised by an event source when its input is used up."""
+
+
+class Recorder():
+    """An event source that reads pygame events and records them.
+
+    The first line of a recording holds the random seed of the session,
+    each following line one frame of events.
+    """
+
+    def __init__(self, path, seed=None):
+        """Open the recording file and choose the session's seed."""
+        if seed is None:
+            seed = random.randrange(2**32)
+        self.seed = seed
+        self.file = open(path, 'w')
+        self.file.write(json.dumps({'seed': seed}) + '\n')
+
+    def events(self, screen):
+        """Return pending pygame events and record them."""
+        events = [pygame.event.wait(screen.idle_timeout)]
+        events.extend(pygame.event.get())
+
+        # Idle wake-ups do not need to be replayed.
+        events = [e for e in events if e.type != pygame.NOEVENT]
+        if events:
+            self.file.write(json.dumps(
+                    [dict(e.dict, type=e.type) for e in events]) + '\n')
+            self.file.flush()
+        return events
+
+
+class RecordedInput():
+    """An event source that replays recorded events."""
+
+    def __init__(self, frames, seed=None):
+        """Initialize with a list of frames, each a list of events."""
+        self.frames = iter(frames)
+        self.seed = seed
+
+    @classmethod
+    def load(cls, path):
+        """Load a recording written by Recorder."""
+        with open(path) as f:
+            seed = json.loads(f.readline())['seed']
+            frames = [[_event(attrs) for attrs in json.loads(line)]
+                      for line in f]
+        return cls(frames, seed)
+
+    def events(self, screen):
+        """Return the next recorded frame of events."""
+        try:
+            return next(self.frames)
+        except StopIteration:
+            raise SessionOver()
+
+
+def _event(attrs):
+    """Rebuild a pygame event from recorded attributes."""
+    attrs = {key: tuple(value) if isinstance(value, list) else value
+             for key, value in attrs.items()}
+    return pygame.event.Event(attrs.pop('type'), attrs)
+
+
+def _key(key, char=''):
+    """Return a key press event."""
+    return pygame.event.Event(pygame.KEYDOWN, key=key, unicode=char)
+
+
+def _click(pos):
+    """Return a mouse click event."""
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1)
+
+
+class GeneratedInput():
+    """An event source that plays randomly for a number of adventures."""
+
+    def __init__(self, adventures, rng=None):
+        """Initialize generated input attributes."""
+        self.adventures = adventures
+        self.rng = rng or random.Random()
+
+    def events(self, current):
+        """Return the input a player could give on the current screen."""
+        if isinstance(current, screen.PlayerNameScreen):
+            name = ''.join(self.rng.choice('abcdefgh') for i in range(5))
+            return ([_key(pygame.K_a, char) for char in name]
+                    + [_key(pygame.K_RETURN)])
+        elif isinstance(current, screen.ReadyScreen):
+            if self.adventures <= 0:
+                raise SessionOver()
+            # Sometimes look at the character screen first.
+            if self.rng.random() < 0.1:
+                return [_click(current.char_rect.center)]
+            return [_key(pygame.K_SPACE)]
+        elif isinstance(current, screen.CharacterScreen):
+            return [_key(pygame.K_ESCAPE)]
+        elif isinstance(current, screen.AdventureMenuScreen):
+            # Sometimes scroll before choosing.
+            if self.rng.random() < 0.1:
+                return [_key(pygame.K_PAGEDOWN)]
+            return [_click(self.rng.choice(current.rows)['rect'].center)]
+        elif isinstance(current, screen.AdventureResultScreen):
+            self.adventures -= 1
+            return [_key(pygame.K_SPACE)]
+        return []
+
+
+def run_session(bg, source, rng=None):
+    """Run one game session with input from an event source.
+
+    Args:
+        bg: The background surface.
+        source: The event source.
+        rng: (GameRandom) Random number stream for the mission list.
+
+    Returns:
+        (Statistics) The results of the session's adventures.
+    """
+    stats = Statistics()
+    screen.Screen.event_source = source
+    screen.Screen.rendering = False
+    try:
+        play(bg, Player(), stats, MissionList(rng))
+    except SessionOver:
+        pass
+    finally:
+        screen.Screen.event_source = None
+        screen.Screen.rendering = True
+    return stats
+
+
+def run_sessions(sessions, adventures, seed=None):
+    """Fast-forward many generated sessions.
+
+    Args:
+        sessions: (int) Number of sessions.
+        adventures: (int) Adventures per session.
+        seed: Seed for generated input and combat.
+
+    Returns:
+        (tuple) Combined Statistics and elapsed seconds.
+    """
+    bg = Background(headless=True)
+    pygame.font.init()
+    rng = GameRandom(seed)
+    stats = Statistics()
+
+    start = perf_counter()
+    for i in range(sessions):
+        source = GeneratedInput(adventures, rng.spawn())
+        stats.merge(run_session(bg, source, rng.spawn()))
+    return stats, perf_counter() - start
+
+
+def add_arguments(parser):
+    """Add session runner arguments."""
+    parser.add_argument("--sessions", help="number of generated sessions",
+                        type=int, default=1000)
+    parser.add_argument("--adventures", help="adventures per session",
+                        type=int, default=5)
+    parser.add_argument("--seed", help="random seed", type=int)
+    parser.add_argument("--replay", help="replay a session recorded with "
+                        "adhop.py --record", metavar="FILE")
+
+
+def main():
+    """Run sessions from the command line."""
+    args = flags.init_flags("Game session runner.", add_arguments)
+
+    if args.replay:
+        bg = Background(headless=True)
+        pygame.font.init()
+        recording = RecordedInput.load(args.replay)
+        stats = run_session(bg, recording, GameRandom(recording.seed))
+    else:
+        stats, elapsed = run_sessions(args.sessions, args.adventures,
+                                      args.seed)
+        print("%d sessions in %.2f s (%.0f sessions/s)"
+              % (args.sessions, elapsed, args.sessions / elapsed))
+
+    logging.info("Played %d adventures.", stats.total())
+    print("Wins: %d Losses: %d Retreats: %d"
+          % (stats.wins, stats.losses, stats.retreats))
+
+
+# Execute this only if running as a standalone
+if __name__ == "__main__":
+    main()
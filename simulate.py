@@ -0,0 +1,191 @@
+"""Run many fights from the command line and stream the results."""
+
+import sys
+import csv
+import json
+import itertools
+from time import perf_counter
+from concurrent.futures import ProcessPoolExecutor
+
+import flags
+import balance
+from mission import Mission, WIN, LOSE, RETREAT
+from catalog import ENEMY_TEMPLATES
+from rng import GameRandom
+
+# Columns of every result row.
+FIELDS = ('fight', 'max_hp', 'min_damage', 'max_damage', 'retreat_ratio',
+          'enemy', 'result', 'player_hp', 'enemy_hp')
+
+RESULT_NAMES = {WIN: 'win', LOSE: 'lose', RETREAT: 'retreat'}
+
+TEMPLATES = {template.name: template for template in ENEMY_TEMPLATES}
+
+def make_chunks(configs, fights, chunk_size=1000, seed=None):
+    """Generate units of work for fights in every configuration.
+
+    Args:
+        configs: (list) (cell, enemy) pairs, where cell is player stats as
+            (max_hp, damage, retreat_ratio) and enemy is an enemy
+            template name or None for the default enemy.
+        fights: (int) Number of fights per configuration.
+        chunk_size: (int) Number of fights per unit of work.
+        seed: Seed for the random number streams.
+
+    Yields:
+        (tuple) Arguments for run_chunk.
+    """
+    # Seeds come from one stream, so results do not depend on workers.
+    seeder = GameRandom(seed)
+    number = 0
+    for cell, enemy in configs:
+        for start in range(0, fights, chunk_size):
+            count = min(chunk_size, fights - start)
+            yield cell, enemy, number, count, seeder.getrandbits(64)
+            number += count
+
+
+def run_chunk(cell, enemy, number, count, seed):
+    """Run a chunk of fights and return one row per fight.
+
+    Args:
+        cell: (tuple) Player stats as (max_hp, damage, retreat_ratio).
+        enemy: (str) Enemy template name, or None for the default enemy.
+        number: (int) Number of the first fight.
+        count: (int) Number of fights.
+        seed: Seed for this chunk's random number stream.
+
+    Returns:
+        (list) Tuples of the FIELDS of each fight.
+    """
+    player = balance.make_player(*cell)
+    if enemy is None:
+        mission = Mission(rng=GameRandom(seed))
+    else:
+        mission = Mission(enemy_name=enemy, rng=GameRandom(seed),
+                          enemy_template=TEMPLATES[enemy])
+    max_hp, (min_damage, max_damage), retreat_ratio = cell
+    enemy_name = mission.enemy.name
+
+    rows = []
+    for fight in range(number, number + count):
+        player.heal()
+        mission.enemy.heal()
+        result = mission.resolve_combat(player)
+        rows.append((fight, max_hp, min_damage, max_damage, retreat_ratio,
+                     enemy_name, RESULT_NAMES[result], player.hp,
+                     mission.enemy.hp))
+    return rows
+
+
+def _run_chunk(args):
+    """Unpack arguments for run_chunk in a worker process."""
+    return run_chunk(*args)
+
+
+def simulate(chunks, workers=1):
+    """Run chunks of fights and generate result rows in order.
+
+    At most two chunks per worker are in flight at once, so memory stays
+    bounded however many fights are run.
+
+    Args:
+        chunks: Iterable of run_chunk arguments, such as make_chunks.
+        workers: (int) Number of worker processes, or 1 to run in this
+            process.
+
+    Yields:
+        (tuple) Tuples of the FIELDS of each fight.
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield from run_chunk(*chunk)
+        return
+
+    chunks = iter(chunks)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = [executor.submit(_run_chunk, chunk)
+                   for chunk in itertools.islice(chunks, 2 * workers)]
+        while pending:
+            rows = pending.pop(0).result()
+            for chunk in itertools.islice(chunks, 1):
+                pending.append(executor.submit(_run_chunk, chunk))
+            yield from rows
+
+
+def progress(rows, total, stream=sys.stderr, interval=1.0):
+    """Pass rows through, reporting progress and throughput.
+
+    Args:
+        rows: Iterable of result rows.
+        total: (int) Expected number of rows.
+        stream: File to report to.
+        interval: (float) Seconds between reports.
+    """
+    start = last = perf_counter()
+    done = 0
+    for row in rows:
+        yield row
+        done += 1
+        # Check the clock only every so often.
+        if done % 1000 == 0:
+            now = perf_counter()
+            if now - last >= interval:
+                last = now
+                stream.write("\r%d/%d fights, %.0f fights/s"
+                             % (done, total, done / (now - start)))
+                stream.flush()
+    elapsed = perf_counter() - start
+    stream.write("\r%d/%d fights, %.0f fights/s\n"
+                 % (done, total, done / elapsed if elapsed else 0))
+
+
+def write_jsonl(rows, output):
+    """Write rows to a file as one JSON object per line."""
+    for row in rows:
+        output.write(json.dumps(dict(zip(FIELDS, row))) + "\n")
+
+
+def write_csv(rows, output):
+    """Write rows to a file as CSV with a header line."""
+    writer = csv.writer(output)
+    writer.writerow(FIELDS)
+    writer.writerows(rows)
+
+
+WRITERS = {'jsonl': write_jsonl, 'csv': write_csv}
+
+def add_arguments(parser):
+    """Add simulator arguments."""
+    balance.add_arguments(parser)
+    parser.add_argument("--enemy", help="enemy types, default a basic enemy",
+                        choices=sorted(TEMPLATES), nargs="+")
+    parser.add_argument("--format", help="output format",
+                        choices=sorted(WRITERS), default="jsonl")
+    parser.add_argument("--output", help="write results to FILE instead of "
+                        "standard output", metavar="FILE")
+    parser.add_argument("--quiet", help="do not report progress",
+                        action="store_true")
+
+
+def main():
+    """Run fights from the command line."""
+    args = flags.init_flags("Batch combat simulator.", add_arguments)
+    grid = balance.make_grid(args.max_hp, args.damage, args.retreat_ratio)
+    configs = list(itertools.product(grid, args.enemy or [None]))
+
+    rows = simulate(make_chunks(configs, args.runs, args.chunk_size,
+                                args.seed), args.workers or 1)
+    if not args.quiet:
+        rows = progress(rows, len(configs) * args.runs)
+
+    if args.output:
+        with open(args.output, 'w', newline='') as output:
+            WRITERS[args.format](rows, output)
+    else:
+        WRITERS[args.format](rows, sys.stdout)
+
+
+# Execute this only if running as a standalone
+if __name__ == "__main__":
+    main()
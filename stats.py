@@ -1,6 +1,8 @@
-"""Classes for displaying win/loss statistics."""
+"""Classes for counting win/loss statistics."""
+
+import threading
+from array import array
 
-import pygame
 import mission
 
 class Statistics():
@@ -19,34 +21,101 @@ class Statistics():
         else:
             self.retreats += 1
 
-    def draw(self, bg):
-        """Draw running statistics of wins and losses."""
-        text_color = (100, 100, 100)
-        font = pygame.font.SysFont(None, 32)
-
-        # Render wins text and position in upper left corner.
-        wins_image = font.render(
-                "Wins: " + str(self.wins), True, text_color)
-        wins_image_rect = wins_image.get_rect()
-        wins_image_rect.top = 10
-        wins_image_rect.left = 10
-
-        # Render losses text and position below wins.
-        losses_image = font.render(
-                "Losses: " + str(self.losses), True, text_color)
-        losses_image_rect = losses_image.get_rect()
-        losses_image_rect.top = wins_image_rect.bottom + 5
-        losses_image_rect.left = 10
-
-        # Render retreats text and position below wins.
-        retreats_image = font.render(
-                "Retreats: " + str(self.retreats), True, text_color)
-        retreats_image_rect = retreats_image.get_rect()
-        retreats_image_rect.top = losses_image_rect.bottom + 5
-        retreats_image_rect.left = 10
-
-        # Draw stats.
-        bg.surface.blit(wins_image, wins_image_rect)
-        bg.surface.blit(losses_image, losses_image_rect)
-        bg.surface.blit(retreats_image, retreats_image_rect)
+    def update_many(self, mission_results):
+        """Record many results at once.
+
+        Args:
+            mission_results: "Constants" WIN, LOSE and RETREAT in a list,
+                tuple, array.array or NumPy array of any shape.
+        """
+        if isinstance(mission_results, (list, tuple, array)):
+            total = len(mission_results)
+            wins = mission_results.count(mission.WIN)
+            losses = mission_results.count(mission.LOSE)
+        else:
+            # Import here so that counting results does not need NumPy.
+            import numpy as np
+            results = np.asarray(mission_results).ravel()
+            total = results.size
+            counts = np.bincount(results, minlength=3)
+            wins = int(counts[mission.WIN])
+            losses = int(counts[mission.LOSE])
+        self.wins += wins
+        self.losses += losses
+        self.retreats += total - wins - losses
+
+    def merge(self, other):
+        """Add the counts of another Statistics to this one."""
+        self.wins += other.wins
+        self.losses += other.losses
+        self.retreats += other.retreats
+
+    def snapshot(self):
+        """Return a copy of the current counts."""
+        copy = Statistics()
+        copy.merge(self)
+        return copy
+
+    def total(self):
+        """Return the number of recorded missions."""
+        return self.wins + self.losses + self.retreats
+
+
+class ShardedStatistics():
+    """Win and loss statistics fed by many threads at once.
+
+    Every thread counts into its own Statistics shard, so updates take
+    no lock and threads never write the same counters. A lock guards only
+    the list of shards, which grows when a thread first records a result.
+    Snapshots add up the shards. Results from other processes arrive as
+    Statistics, e.g. from their snapshot(), through merge.
+    """
+
+    def __init__(self):
+        """Initialize with no shards."""
+        self.shards = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def shard(self):
+        """Return the calling thread's Statistics shard.
+
+        Hot loops can keep the shard and update it directly.
+        """
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = Statistics()
+            with self._lock:
+                self.shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def update(self, mission_result):
+        """Record a result in the calling thread's shard."""
+        self.shard().update(mission_result)
+
+    def update_many(self, mission_results):
+        """Record many results in the calling thread's shard."""
+        self.shard().update_many(mission_results)
+
+    def merge(self, other):
+        """Add the counts of a Statistics, e.g. from another process."""
+        self.shard().merge(other)
+
+    def snapshot(self):
+        """Return the counts of all shards as one Statistics.
+
+        Each counter only grows, so a snapshot taken while threads are
+        counting holds at least every result recorded before it started.
+        """
+        with self._lock:
+            shards = list(self.shards)
+        total = Statistics()
+        for shard in shards:
+            total.merge(shard)
+        return total
 
+    def total(self):
+        """Return the number of recorded missions."""
+        return self.snapshot().total()
@@ -27,3 +27,54 @@ class ActorTestCase(unittest.TestCase):
         player.heal(heal_hp)
         self.assertEqual(player.hp, player.max_hp + heal_hp)
 
+    def test_slots(self):
+        """Test that actors have no per-instance dict."""
+        player = actor.Player()
+        with self.assertRaises(AttributeError):
+            player.speed = 1
+
+
+class ActorArrayTestCase(unittest.TestCase):
+    """Tests for ActorArray class."""
+
+    def test_from_actor(self):
+        """Test creating a roster of copies."""
+        roster = actor.ActorArray.from_actor(actor.Player(), 5)
+        self.assertEqual(len(roster), 5)
+        self.assertEqual(roster.get(4).max_damage, 3)
+
+    def test_full_heal(self):
+        """Test healing every character to full."""
+        roster = actor.ActorArray.from_actor(actor.Actor(), 3)
+        roster.damage([1, 2, 3])
+        roster.heal()
+        self.assertEqual(list(roster.hp), list(roster.max_hp))
+
+    def test_partial_heal(self):
+        """Test partial healing within max hp."""
+        roster = actor.ActorArray.from_actor(actor.Actor(), 2)
+        roster.damage([5, 1])
+        roster.heal(2)
+        self.assertEqual(list(roster.hp), [7, 10])
+
+    def test_damage(self):
+        """Test bulk damage."""
+        roster = actor.ActorArray()
+        roster.append(actor.Actor())
+        roster.append(actor.Player())
+        roster.damage([3, 12])
+        self.assertEqual(list(roster.hp), [7, -2])
+        with self.assertRaises(ValueError):
+            roster.damage([1])
+
+    def test_update_in_place(self):
+        """Test that views of the hp buffer see damage and healing."""
+        roster = actor.ActorArray.from_actor(actor.Actor(), 3)
+        view = memoryview(roster.hp)
+        roster.damage([1, 2, 3])
+        self.assertEqual(view.tolist(), [9, 8, 7])
+        roster.heal(1)
+        self.assertEqual(view.tolist(), [10, 9, 8])
+        roster.heal()
+        self.assertEqual(view.tolist(), [10, 10, 10])
+        view.release()
@@ -0,0 +1,14 @@
+import unittest
+
+import pygame
+
+from background import Background
+
+class BackgroundTestCase(unittest.TestCase):
+    """Tests for Background class."""
+
+    def test_headless(self):
+        """Test creating an offscreen background."""
+        bg = Background((320, 200), headless=True)
+        self.assertEqual(bg.surface.get_size(), (320, 200))
+        self.assertEqual(pygame.display.get_driver(), 'dummy')
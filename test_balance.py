@@ -0,0 +1,66 @@
+import unittest
+
+import balance
+from mission import Mission, WIN, LOSE
+from rng import GameRandom
+
+class BalanceSweepTestCase(unittest.TestCase):
+    """Tests for parallel balance sweeps."""
+
+    def test_sweep_totals(self):
+        """Test that every cell runs the requested number of fights."""
+        grid = balance.make_grid([8, 10], [(1, 2), (1, 3)], [0, 0.1])
+        results = balance.sweep(grid, 250, workers=2, chunk_size=100)
+        self.assertEqual(len(results), 8)
+        for stats in results.values():
+            self.assertEqual(stats.total(), 250)
+
+    def test_sweep_seed(self):
+        """Test that a seeded sweep is reproducible."""
+        grid = balance.make_grid([10], [(1, 3)], [0.1])
+        first = balance.sweep(grid, 300, workers=2, chunk_size=100, seed=5)
+        second = balance.sweep(grid, 300, workers=1, chunk_size=100, seed=5)
+        self.assertEqual(vars(first[grid[0]]), vars(second[grid[0]]))
+
+    def test_parse_damage(self):
+        """Test parsing a damage range."""
+        self.assertEqual(balance.parse_damage("1-3"), (1, 3))
+
+    def test_wilson_interval(self):
+        """Test that the interval brackets the observed ratio."""
+        low, high = balance.wilson_interval(30, 100, 1.96)
+        self.assertLess(low, 0.3)
+        self.assertGreater(high, 0.3)
+        self.assertGreater(low, 0.2)
+
+
+class EstimateTestCase(unittest.TestCase):
+    """Tests for adaptive early stopping."""
+
+    def test_clear_cases_stop_early(self):
+        """Test that far-off bands are decided in a few hundred fights."""
+        estimate = balance.estimate(
+                balance.make_player(10, (1, 3), 0.1),
+                Mission(rng=GameRandom(1)),
+                {WIN: (0.5, 0.95), LOSE: (0.5, 1.0)})
+        self.assertLessEqual(estimate.runs, 400)
+        self.assertEqual(estimate.decisions, {WIN: True, LOSE: False})
+        self.assertEqual(estimate.stats.total(), estimate.runs)
+
+    def test_undecided(self):
+        """Test that a band at the true ratio stays undecided."""
+        estimate = balance.estimate(
+                balance.make_player(10, (1, 3), 0.1),
+                Mission(rng=GameRandom(2)),
+                {WIN: (0.75, 0.76)}, max_runs=800)
+        self.assertEqual(estimate.runs, 800)
+        self.assertIsNone(estimate.decisions[WIN])
+
+    def test_sweep_adaptive(self):
+        """Test estimating a grid over a process pool."""
+        grid = balance.make_grid([10, 30], [(1, 3)], [0.1])
+        results = balance.sweep_adaptive(grid, {WIN: (0.5, 1.0)},
+                                         workers=2, seed=3)
+        self.assertEqual(set(results), set(grid))
+        for estimate in results.values():
+            self.assertTrue(estimate.decisions[WIN])
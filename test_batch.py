@@ -0,0 +1,59 @@
+import unittest
+from array import array
+
+import actor as a
+import mission as m
+from batch import resolve_combat_batch
+
+class BatchCombatTestCase(unittest.TestCase):
+    """Tests for batch combat resolution."""
+
+    def test_player_l1_enemy_l1(self):
+        """Test batch balance matches scalar balance bands."""
+        runs = 10000
+        batch = resolve_combat_batch(a.Player(), a.Actor(), runs, seed=1)
+
+        self.assertEqual(batch.wins + batch.losses + batch.retreats, runs)
+        loss_ratio = batch.losses / runs
+        retreat_ratio = batch.retreats / runs
+        self.assertLessEqual(
+                loss_ratio, 0.07, msg="Losses higher than 7%")
+        self.assertGreaterEqual(
+                loss_ratio, 0.06, msg="Losses lower than 6%")
+        self.assertLessEqual(
+                retreat_ratio, 0.19, msg="Retreats higher than 19%")
+        self.assertGreaterEqual(
+                retreat_ratio, 0.17, msg="Retreats lower than 17%")
+
+    def test_same_seed(self):
+        """Test that the same seed gives the same fights."""
+        player = a.Player()
+        enemy = a.Actor()
+        first = resolve_combat_batch(player, enemy, 100, seed=7)
+        second = resolve_combat_batch(player, enemy, 100, seed=7)
+        self.assertEqual(first.results.tolist(), second.results.tolist())
+        self.assertEqual(first.player_hp.tolist(),
+                second.player_hp.tolist())
+
+    def test_player_wins(self):
+        """Test player winning against a nearly dead enemy."""
+        enemy = a.Actor()
+        enemy.hp = 1
+        batch = resolve_combat_batch(a.Player(), enemy, 100, seed=0)
+        self.assertEqual(batch.wins, 100)
+
+    def test_player_loses(self):
+        """Test player losing with no hp."""
+        player = a.Player()
+        player.hp = 0
+        batch = resolve_combat_batch(player, a.Actor(), 100, seed=0)
+        self.assertEqual(batch.losses, 100)
+        self.assertEqual(batch.player_hp.max(), 0)
+
+    def test_actor_array(self):
+        """Test fighting a roster with one enemy per fight."""
+        enemies = a.ActorArray.from_actor(a.Actor(), 100)
+        enemies.hp[:50] = array('q', [1]) * 50
+        batch = resolve_combat_batch(a.Player(), enemies, 100, seed=0)
+        self.assertEqual(batch.results[:50].tolist(), [m.WIN] * 50)
+        self.assertEqual(enemies.hp[99], 10)
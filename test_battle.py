@@ -0,0 +1,82 @@
+import unittest
+from collections import deque
+
+import actor as a
+import battle as b
+import mission as m
+from rng import GameRandom
+
+class LivingIndexTestCase(unittest.TestCase):
+    """Tests for the index of combatants still fighting."""
+
+    def test_remove(self):
+        """Test removing combatants keeps the rest."""
+        living = b.LivingIndex()
+        for i in range(5):
+            living.add(i)
+        living.remove(1)
+        living.remove(4)
+        self.assertEqual(len(living), 3)
+        self.assertEqual(sorted(living.members), [0, 2, 3])
+        self.assertNotIn(1, living)
+        self.assertIn(living.choice(GameRandom(1)), (0, 2, 3))
+
+
+class BattleTestCase(unittest.TestCase):
+    """Tests for battles between parties."""
+
+    def test_party_wins(self):
+        """Test a party beating a weak horde."""
+        players = [a.Player() for i in range(3)]
+        enemies = [a.Actor() for i in range(3)]
+        for enemy in enemies:
+            enemy.hp = 1
+        battle = b.Battle(players, enemies, rng=GameRandom(1))
+        self.assertEqual(battle.resolve_combat(), m.WIN)
+
+    def test_party_loses(self):
+        """Test a party that cannot fight."""
+        players = [a.Player() for i in range(2)]
+        for player in players:
+            player.hp = 0
+        battle = b.Battle(players, [a.Actor()], rng=GameRandom(1))
+        self.assertEqual(battle.resolve_combat(), m.LOSE)
+
+    def test_empty_side(self):
+        """Test that both sides need combatants."""
+        with self.assertRaises(ValueError):
+            b.Battle([a.Player()], [])
+
+    def test_initiative(self):
+        """Test that higher initiative acts first."""
+        players = [a.Player()]
+        enemies = [a.Actor() for i in range(3)]
+        enemies[2].initiative = 5
+        battle = b.Battle(players, enemies, rng=GameRandom(3))
+        self.assertEqual(battle.initiative_order()[0], 3)
+
+        events = deque()
+        battle.resolve_combat(events)
+        self.assertEqual(events[0].attacker, m.ENEMY_SIDE)
+
+    def test_large_battle(self):
+        """Test a battle with a thousand combatants."""
+        players = [a.Player() for i in range(500)]
+        enemies = [a.Actor() for i in range(500)]
+        events = deque()
+        battle = b.Battle(players, enemies, rng=GameRandom(5))
+        result = battle.resolve_combat(events)
+        self.assertIn(result, (m.WIN, m.LOSE, m.RETREAT))
+        self.assertEqual(events[-1].result, result)
+        self.assertTrue(all(player.hp >= 0 for player in players))
+
+    def test_seeded_battle(self):
+        """Test that seeded battles fight the same fights."""
+        results = []
+        for i in range(2):
+            players = [a.Player() for j in range(4)]
+            enemies = [a.Actor() for j in range(6)]
+            battle = b.Battle(players, enemies, rng=GameRandom(8))
+            results.append((battle.resolve_combat(),
+                            [actor.hp for actor in players + enemies]))
+        self.assertEqual(results[0], results[1])
@@ -0,0 +1,60 @@
+import unittest
+
+from catalog import MissionCatalog, ENEMY_TEMPLATES
+from mission import MissionList
+from rng import GameRandom
+
+class MissionCatalogTestCase(unittest.TestCase):
+    """Tests for MissionCatalog class."""
+
+    def setUp(self):
+        """Generate a catalog."""
+        self.catalog = MissionCatalog.generate(1000, GameRandom(9))
+
+    def test_lazy_missions(self):
+        """Test that missions and enemies are created on access."""
+        self.assertEqual(len(self.catalog), 1000)
+        self.assertEqual(len(self.catalog._missions), 0)
+        mission = self.catalog[3]
+        self.assertIsNone(mission._enemy)
+        self.assertIs(self.catalog[3], mission)
+
+    def test_enemy_template(self):
+        """Test that enemies get the stats of their template."""
+        for mission in self.catalog.with_enemy('Troll')[:5]:
+            self.assertEqual(mission.enemy.max_hp, 20)
+            self.assertEqual(mission.enemy.hp, 20)
+
+    def test_with_difficulty(self):
+        """Test filtering by difficulty."""
+        missions = self.catalog.with_difficulty(2, 3)
+        expected = [i for i in range(len(self.catalog))
+                    if 2 <= self.catalog.difficulty(i) <= 3]
+        self.assertEqual(sorted(missions.numbers), expected)
+
+    def test_with_enemy(self):
+        """Test filtering by enemy type."""
+        total = sum(len(self.catalog.with_enemy(template.name))
+                    for template in ENEMY_TEMPLATES)
+        self.assertEqual(total, len(self.catalog))
+        for mission in self.catalog.with_enemy('Rat'):
+            self.assertEqual(mission.enemy_name, 'Rat')
+
+    def test_with_title(self):
+        """Test filtering by title prefix."""
+        missions = self.catalog.with_title('Slay the ')
+        self.assertGreater(len(missions), 0)
+        expected = sum(title.startswith('Slay the ')
+                       for title in self.catalog.titles)
+        self.assertEqual(len(missions), expected)
+
+    def test_same_seed(self):
+        """Test that a seeded catalog is reproducible."""
+        other = MissionCatalog.generate(1000, GameRandom(9))
+        self.assertEqual(other.titles, self.catalog.titles)
+        self.assertEqual(other.seeds, self.catalog.seeds)
+
+    def test_mission_list(self):
+        """Test offering a catalog through a mission list."""
+        mission_list = MissionList(catalog=self.catalog)
+        self.assertIs(mission_list.missions, self.catalog)
@@ -0,0 +1,54 @@
+import unittest
+
+import actor as a
+import mission as m
+from catalog import MissionCatalog, ENEMY_TEMPLATES
+from difficulty import DifficultyService
+from rng import GameRandom
+
+class DifficultyServiceTestCase(unittest.TestCase):
+    """Tests for cached win chance estimates."""
+
+    def test_win_chance(self):
+        """Test that estimates match exact odds at full hp."""
+        player = a.Player()
+        enemy = a.Actor()
+        service = DifficultyService(player)
+        player.hp = 1
+        enemy.hp = 1
+        self.assertEqual(service.win_chance(enemy),
+                         m.combat_odds(a.Player(), a.Actor()).win)
+
+    def test_cache(self):
+        """Test that repeated estimates come from the cache."""
+        service = DifficultyService(a.Player())
+        for i in range(3):
+            service.win_chance(a.Actor())
+        self.assertEqual((service.hits, service.misses), (2, 1))
+
+    def test_invalidate(self):
+        """Test that changing player stats clears the cache."""
+        player = a.Player()
+        service = DifficultyService(player)
+        before = service.win_chance(a.Actor())
+        player.max_damage = 5
+        self.assertGreater(service.win_chance(a.Actor()), before)
+        self.assertEqual(service.misses, 2)
+
+    def test_maxsize(self):
+        """Test that the least recently used estimate is dropped."""
+        service = DifficultyService(a.Player(), maxsize=2)
+        for template in ENEMY_TEMPLATES[:3]:
+            service.win_chance(template)
+        service.win_chance(ENEMY_TEMPLATES[0])
+        self.assertEqual(service.misses, 4)
+
+    def test_balanced_catalog(self):
+        """Test generating missions in win chance bands."""
+        service = DifficultyService(a.Player())
+        bands = [(0.9, 1.0)]
+        catalog = MissionCatalog.generate(200, GameRandom(1),
+                                          difficulty=service, bands=bands)
+        for template in set(catalog.enemies):
+            self.assertGreaterEqual(
+                    service.win_chance(ENEMY_TEMPLATES[template]), 0.9)
@@ -0,0 +1,61 @@
+import os
+import unittest
+import tempfile
+
+import actor as a
+import mission as m
+import events
+
+class CombatEventsTestCase(unittest.TestCase):
+    """Tests for structured combat events."""
+
+    def fight(self, sink, fights=20):
+        """Fight a number of seeded fights into an event sink."""
+        player = a.Player()
+        mission = m.Mission('Slay the Rat', 'Rat', m.GameRandom(3))
+        for i in range(fights):
+            player.heal()
+            mission.enemy.heal()
+            mission.resolve_combat(player, sink)
+
+    def test_hit_events(self):
+        """Test that a fight's hits end with its fight event."""
+        sink = []
+        self.fight(sink, 1)
+        fight = sink[-1]
+        self.assertIsInstance(fight, m.FightEvent)
+        self.assertEqual(fight.turns, len(sink) - 1)
+        self.assertEqual([hit.turn for hit in sink[:-1]],
+                         list(range(fight.turns)))
+
+    def test_ring_buffer(self):
+        """Test that the ring buffer keeps only recent events."""
+        sink = events.ring_buffer(10)
+        self.fight(sink)
+        self.assertEqual(len(sink), 10)
+        self.assertIsInstance(sink[-1], m.FightEvent)
+
+    def test_event_log(self):
+        """Test writing and streaming back an event log."""
+        sink = []
+        self.fight(sink)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'combat.log')
+        log = events.EventLog(path, chunk_size=50)
+        for event in sink:
+            log.append(event)
+        log.close()
+        self.assertEqual(list(events.read_events(path)), sink)
+
+    def test_analytics(self):
+        """Test streaming analytics."""
+        analytics = events.CombatAnalytics()
+        self.fight(analytics, 100)
+        stats = analytics.missions['Slay the Rat']
+        self.assertEqual(stats.total(), 100)
+        self.assertEqual(sum(analytics.fight_lengths.values()), 100)
+        self.assertEqual(set(analytics.damage_histogram), {1, 2, 3})
+        self.assertEqual(analytics.win_rate('Slay the Rat'),
+                         stats.wins / 100)
+        self.assertGreater(analytics.mean_fight_length(), 0)
@@ -0,0 +1,54 @@
+import os
+import json
+import unittest
+import tempfile
+
+import actor as a
+import mission as m
+import instrument
+
+class InstrumentTestCase(unittest.TestCase):
+    """Tests for opt-in instrumentation."""
+
+    def setUp(self):
+        """Enable instrumentation."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'timers.json')
+        original = m.Mission.resolve_combat
+        instrument.enable(self.path)
+        self.addCleanup(lambda: self.assertIs(
+                m.Mission.resolve_combat, original))
+        self.addCleanup(instrument.disable)
+
+    def test_resolve_combat(self):
+        """Test timing combat and dumping the timers."""
+        mission = m.Mission()
+        player = a.Player()
+        count = instrument.timers['Mission.resolve_combat'].count
+        for i in range(5):
+            player.heal()
+            mission.enemy.heal()
+            mission.resolve_combat(player)
+        timer = instrument.timers['Mission.resolve_combat']
+        self.assertEqual(timer.count - count, 5)
+        self.assertEqual(sum(timer.histogram), timer.count)
+
+        instrument.dump(self.path)
+        with open(self.path) as f:
+            results = json.load(f)
+        self.assertEqual(results['Mission.resolve_combat']['count'],
+                         timer.count)
+
+    def test_enable_twice(self):
+        """Test that enabling again does not wrap methods twice."""
+        with self.assertRaises(RuntimeError):
+            instrument.enable(self.path)
+
+    def test_disable(self):
+        """Test that disabling drops the profiler and the timers."""
+        instrument.disable()
+        instrument.enable(self.path[:-len('.json')] + '.prof')
+        instrument.disable()
+        self.assertIsNone(instrument._profiler)
+        self.assertEqual(instrument.timers, {})
@@ -1,6 +1,7 @@
 import unittest
 
 import actor as a
+import balance
 import mission as m
 
 class CombatBalanceTestCase(unittest.TestCase):
@@ -8,33 +9,14 @@ class CombatBalanceTestCase(unittest.TestCase):
 
     def test_player_l1_enemy_l1(self):
         """Test level 1 player vs level 1 enemy."""
-        losses = 0
-        retreats = 0
-        runs = 10000
-        player = a.Player()
-        mission = m.Mission()
-
-        for i in range(runs):
-            player.heal()
-            mission.__init__()
-            mission_result = mission.resolve_combat(player)
-            if mission_result == m.LOSE:
-                losses += 1
-            elif mission_result == m.RETREAT:
-                retreats += 1
-
-        loss_ratio = losses / runs
-        retreat_ratio = retreats / runs
-#        print("\nLosses: " + str(loss_ratio)
-#                + "\nRetreats: " + str(retreat_ratio))
-        self.assertLessEqual(
-                loss_ratio, 0.07, msg="Losses higher than 7%")
-        self.assertGreaterEqual(
-                loss_ratio, 0.06, msg="Losses lower than 6%")
-        self.assertLessEqual(
-                retreat_ratio, 0.19, msg="Retreats higher than 19%")
-        self.assertGreaterEqual(
-                retreat_ratio, 0.17, msg="Retreats lower than 17%")
+        # Fights run until both ratios are known to be in or out of their
+        # bands, with at most a 0.1% chance of a wrong verdict.
+        estimate = balance.estimate(a.Player(), m.Mission(), {
+                m.LOSE: (0.06, 0.07), m.RETREAT: (0.17, 0.19)})
+        self.assertTrue(estimate.decisions[m.LOSE],
+                        msg="Losses outside 6-7%")
+        self.assertTrue(estimate.decisions[m.RETREAT],
+                        msg="Retreats outside 17-19%")
 
 
 class MissionTestCase(unittest.TestCase):
@@ -54,3 +36,64 @@ class MissionTestCase(unittest.TestCase):
         player.hp = 0
         self.assertEqual(mission.resolve_combat(player), m.LOSE)
 
+    def test_seeded_mission(self):
+        """Test that seeded missions fight the same fights."""
+        results = []
+        for i in range(2):
+            mission = m.Mission(rng=m.GameRandom(8))
+            player = a.Player()
+            fights = []
+            for j in range(50):
+                player.heal()
+                mission.enemy.heal()
+                fights.append((mission.resolve_combat(player), player.hp))
+            results.append(fights)
+        self.assertEqual(results[0], results[1])
+
+
+class CombatOddsTestCase(unittest.TestCase):
+    """Tests for exact combat outcome probabilities."""
+
+    def test_player_l1_enemy_l1(self):
+        """Test level 1 player vs level 1 enemy odds."""
+        odds = m.combat_odds(a.Player(), a.Actor())
+        self.assertAlmostEqual(odds.win + odds.lose + odds.retreat, 1)
+        self.assertLessEqual(odds.lose, 0.07, msg="Losses higher than 7%")
+        self.assertGreaterEqual(odds.lose, 0.06, msg="Losses lower than 6%")
+        self.assertLessEqual(
+                odds.retreat, 0.19, msg="Retreats higher than 19%")
+        self.assertGreaterEqual(
+                odds.retreat, 0.17, msg="Retreats lower than 17%")
+
+    def test_player_wins(self):
+        """Test odds of player winning."""
+        enemy = a.Actor()
+        enemy.hp = 1
+        odds = m.combat_odds(a.Player(), enemy)
+        self.assertEqual(odds.win, 1)
+        self.assertEqual(odds.enemy_hp, 0)
+
+    def test_player_loses(self):
+        """Test odds of player losing."""
+        player = a.Player()
+        player.hp = 0
+        odds = m.combat_odds(player, a.Actor())
+        self.assertEqual(odds.lose, 1)
+        self.assertEqual(odds.player_hp, 0)
+
+    def test_zero_damage(self):
+        """Test odds when a hit can deal no damage."""
+        player = a.Player()
+        player.min_damage = 0
+        odds = m.combat_odds(player, a.Actor())
+        self.assertAlmostEqual(odds.win + odds.lose + odds.retreat, 1)
+        self.assertLess(odds.win, m.combat_odds(a.Player(), a.Actor()).win)
+
+    def test_no_damage(self):
+        """Test that combat without damage is rejected."""
+        player = a.Player()
+        enemy = a.Actor()
+        player.min_damage = player.max_damage = 0
+        enemy.min_damage = enemy.max_damage = 0
+        with self.assertRaises(ValueError):
+            m.combat_odds(player, enemy)
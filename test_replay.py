@@ -0,0 +1,127 @@
+import os
+import tempfile
+import unittest
+from array import array
+
+import actor as a
+import mission as m
+from replay import Replay, ReplayRecorder, ReplayLog, read_replays
+from rng import GameRandom
+
+def record(seed, player=None):
+    """Fight a seeded mission and return the mission, player and
+    replay."""
+    player = player if player is not None else a.Player()
+    mission = m.Mission(rng=GameRandom(seed))
+    recorder = ReplayRecorder(player, mission.enemy, seed)
+    mission.resolve_combat(player, recorder)
+    return mission, player, recorder.replay
+
+
+class ReplayTestCase(unittest.TestCase):
+    """Tests for compact fight replays."""
+
+    def test_run(self):
+        """Test that replays re-run to the same ending."""
+        for seed in range(50):
+            mission, player, replay = record(seed)
+            self.assertEqual(replay.run(),
+                             (mission.result, player.hp, mission.enemy.hp))
+
+    def test_no_hits(self):
+        """Test a fight that ends before anyone hits."""
+        player = a.Player()
+        player.hp = 0
+        replay = Replay(0, m.PLAYER_SIDE, m.combat_stats(player),
+                        m.combat_stats(a.Actor()), array('B'))
+        self.assertEqual(replay.run(), (m.LOSE, 0, 10))
+
+    def test_hits(self):
+        """Test that decoded hits match the fight's events."""
+        player = a.Player()
+        mission = m.Mission(rng=GameRandom(3))
+        recorder = ReplayRecorder(player, mission.enemy)
+        events = []
+
+        class Both():
+            def append(self, event):
+                events.append(event)
+                recorder.append(event)
+
+        mission.resolve_combat(player, Both())
+        self.assertEqual(list(recorder.replay.hits()), events[:-1])
+
+    def test_seek(self):
+        """Test seeking to a turn."""
+        mission, player, replay = record(7)
+        for turn, hit in enumerate(replay.hits()):
+            hp = replay.seek(turn + 1)
+            self.assertEqual(hp[1 - hit.attacker], hit.remaining_hp)
+        self.assertEqual(replay.seek(10000)[1], mission.enemy.hp)
+
+    def test_encode(self):
+        """Test that encoding is compact and decodes exactly."""
+        mission, player, replay = record(5)
+        data = replay.encode()
+        self.assertEqual(len(data), 62 + len(replay))
+        decoded, size = Replay.decode(data)
+        self.assertEqual(size, len(data))
+        self.assertEqual(decoded.run(), replay.run())
+        self.assertEqual(decoded.damages, replay.damages)
+
+    def test_bad_replay(self):
+        """Test that tampered replays are rejected."""
+        mission, player, replay = record(5)
+        replay.damages[0] = 100
+        with self.assertRaises(ValueError):
+            replay.run()
+
+    def test_log(self):
+        """Test streaming replays from a log file."""
+        replays = [record(seed)[2] for seed in range(20)]
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        log = ReplayLog(path)
+        for replay in replays:
+            log.append(replay)
+        log.close()
+        self.assertEqual([(r.seed, r.run()) for r in read_replays(path)],
+                         [(r.seed, r.run()) for r in replays])
+
+    def test_log_flushed(self):
+        """Test that appended replays reach the file before closing."""
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        log = ReplayLog(path)
+        self.addCleanup(log.close)
+        log.append(record(1)[2])
+        self.assertEqual(len(list(read_replays(path))), 1)
+
+    def test_truncated_log(self):
+        """Test that an incomplete last replay is skipped."""
+        replays = [record(seed)[2] for seed in range(3)]
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        log = ReplayLog(path)
+        for replay in replays:
+            log.append(replay)
+        log.close()
+        for cut in (2, len(replays[-1].encode()) - 3):
+            with open(path, 'r+b') as f:
+                f.truncate(os.path.getsize(path) - cut)
+            self.assertEqual([r.seed for r in read_replays(path)], [0, 1])
+            # Restore the file for the next cut.
+            with open(path, 'ab') as f:
+                f.write(replays[-1].encode()[-cut:])
+
+    def test_mission_seeds(self):
+        """Test that missions in the default list keep their seeds."""
+        missions = m.MissionList(GameRandom(6)).missions
+        seeds = [mission.seed for mission in missions]
+        self.assertNotIn(0, seeds)
+        self.assertEqual(len(set(seeds)), len(seeds))
+        self.assertEqual(missions[0].rng.random(),
+                         GameRandom(seeds[0]).random())
@@ -0,0 +1,50 @@
+import pickle
+import unittest
+
+from rng import GameRandom
+
+class GameRandomTestCase(unittest.TestCase):
+    """Tests for GameRandom class."""
+
+    def test_seed(self):
+        """Test that a seeded stream is reproducible."""
+        first = GameRandom(4)
+        second = GameRandom(4)
+        self.assertEqual([first.damage(1, 3) for i in range(1000)],
+                         [second.damage(1, 3) for i in range(1000)])
+
+    def test_reseed(self):
+        """Test that reseeding drops pre-drawn damage rolls."""
+        rng = GameRandom(4)
+        rolls = [rng.damage(1, 3) for i in range(10)]
+        rng.seed(4)
+        self.assertEqual([rng.damage(1, 3) for i in range(10)], rolls)
+
+    def test_damage_range(self):
+        """Test that damage rolls cover the range inclusively."""
+        rng = GameRandom(5)
+        rolls = {rng.damage(1, 3) for i in range(1000)}
+        self.assertEqual(rolls, {1, 2, 3})
+
+    def test_split(self):
+        """Test that split streams differ from each other."""
+        streams = GameRandom(6).split(3)
+        rolls = [tuple(s.damage(1, 100) for i in range(20)) for s in streams]
+        self.assertEqual(len(set(rolls)), 3)
+
+    def test_setstate(self):
+        """Test that restoring a state replays pre-drawn damage rolls."""
+        rng = GameRandom(1)
+        rng.damage(1, 3)
+        state = rng.getstate()
+        rolls = [rng.damage(1, 3) for i in range(100)]
+        rng.setstate(state)
+        self.assertEqual([rng.damage(1, 3) for i in range(100)], rolls)
+
+    def test_pickle(self):
+        """Test that a pickled copy continues the same damage rolls."""
+        rng = GameRandom(1)
+        rng.damage(1, 3)
+        copy = pickle.loads(pickle.dumps(rng))
+        self.assertEqual([copy.damage(1, 3) for i in range(100)],
+                         [rng.damage(1, 3) for i in range(100)])
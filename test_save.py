@@ -0,0 +1,82 @@
+import os
+import unittest
+import tempfile
+
+import mission
+from actor import Player
+from stats import Statistics
+from catalog import MissionCatalog
+from rng import GameRandom
+from save import SaveFile
+
+class SaveFileTestCase(unittest.TestCase):
+    """Tests for SaveFile class."""
+
+    def setUp(self):
+        """Create a save file path and some game state."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'game.sav')
+        self.save_file = SaveFile(self.path)
+        self.player = Player('Hero')
+        self.player.max_hp = 12
+        self.stats = Statistics()
+        self.stats.update(mission.WIN)
+
+    def tearDown(self):
+        """Close the save file."""
+        self.save_file.close()
+
+    def test_snapshot(self):
+        """Test saving and loading player and statistics."""
+        self.save_file.save(self.player, self.stats)
+        player, stats, catalog = SaveFile(self.path).load()
+        self.assertEqual(player.name, 'Hero')
+        self.assertEqual(player.max_hp, 12)
+        self.assertEqual(stats.wins, 1)
+        self.assertIsNone(catalog)
+
+    def test_append_results(self):
+        """Test that appended results are replayed on load."""
+        self.save_file.save(self.player, self.stats)
+        size = os.path.getsize(self.path)
+        self.save_file.append_result(mission.LOSE, 0)
+        self.save_file.append_result(mission.RETREAT, 1)
+        self.assertLess(os.path.getsize(self.path) - size, 40)
+
+        player, stats, catalog = self.save_file.load()
+        self.assertEqual((stats.wins, stats.losses, stats.retreats),
+                         (1, 1, 1))
+        self.assertEqual(player.hp, 1)
+
+    def test_catalog(self):
+        """Test saving and loading a mission catalog."""
+        catalog = MissionCatalog.generate(500, GameRandom(2))
+        self.save_file.save(self.player, self.stats, catalog)
+        player, stats, loaded = self.save_file.load()
+        self.assertEqual(loaded.titles, catalog.titles)
+        self.assertEqual(loaded.enemies, catalog.enemies)
+        self.assertEqual(loaded.seeds, catalog.seeds)
+        self.assertEqual(loaded.enemy_templates, catalog.enemy_templates)
+        self.assertEqual(loaded[7].enemy.max_hp, catalog[7].enemy.max_hp)
+
+    def test_truncated_result(self):
+        """Test that an incomplete last result is skipped on load."""
+        self.save_file.save(self.player, self.stats)
+        self.save_file.append_result(mission.LOSE, 0)
+        self.save_file.append_result(mission.RETREAT, 1)
+        self.save_file.close()
+        with open(self.path, 'r+b') as f:
+            f.truncate(os.path.getsize(self.path) - 3)
+
+        player, stats, catalog = self.save_file.load()
+        self.assertEqual((stats.wins, stats.losses, stats.retreats),
+                         (1, 1, 0))
+        self.assertEqual(player.hp, 0)
+
+    def test_bad_file(self):
+        """Test that other files are rejected."""
+        with open(self.path, 'wb') as f:
+            f.write(b'not a save file')
+        with self.assertRaises(ValueError):
+            self.save_file.load()
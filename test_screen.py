@@ -0,0 +1,206 @@
+import asyncio
+import unittest
+
+import pygame
+
+import screen
+from actor import Player
+from background import Background
+from catalog import MissionCatalog, ENEMY_TEMPLATES
+from difficulty import DifficultyService
+from mission import MissionList
+from rng import GameRandom
+from stats import Statistics
+
+class AdventureMenuScreenTestCase(unittest.TestCase):
+    """Tests for the virtualized adventure menu."""
+
+    def setUp(self):
+        """Create a menu of many missions on a headless background."""
+        self.bg = Background(headless=True)
+        pygame.font.init()
+        self.mission_list = MissionList(
+                catalog=MissionCatalog.generate(10000, GameRandom(1)))
+        self.menu = screen.AdventureMenuScreen(self.bg, self.mission_list)
+
+    def key(self, key):
+        """Send a key press to the menu."""
+        self.menu.catch_special_events(
+                pygame.event.Event(pygame.KEYDOWN, key=key, unicode=''))
+
+    def test_visible_rows(self):
+        """Test that only visible rows are rendered."""
+        self.assertGreater(self.menu.visible_rows, 0)
+        self.assertEqual(len(self.menu.rows), self.menu.visible_rows)
+        self.assertLess(len(self.mission_list.missions._missions), 100)
+
+    def test_scroll(self):
+        """Test scrolling and its limits."""
+        self.key(pygame.K_DOWN)
+        self.assertEqual(self.menu.first_row, 1)
+        self.assertEqual(self.menu.rows[0]['index'], 1)
+        self.key(pygame.K_UP)
+        self.key(pygame.K_UP)
+        self.assertEqual(self.menu.first_row, 0)
+        self.menu.scroll(20000)
+        self.assertEqual(self.menu.rows[-1]['index'], 9999)
+
+    def test_click(self):
+        """Test choosing the mission under a click."""
+        self.menu.scroll(500)
+        row = self.menu.rows[2]
+        self.menu.active = True
+        self.menu.catch_special_events(pygame.event.Event(
+                pygame.MOUSEBUTTONDOWN, pos=row['rect'].center, button=1))
+        self.assertIs(self.mission_list.get_active_mission(),
+                      self.mission_list.missions[502])
+        self.assertFalse(self.menu.active)
+
+    def test_click_outside(self):
+        """Test that clicks beside the titles choose nothing."""
+        self.menu.catch_special_events(pygame.event.Event(
+                pygame.MOUSEBUTTONDOWN, pos=(0, 0), button=1))
+        self.assertIsNone(self.mission_list.get_active_mission())
+
+    def test_static_layer(self):
+        """Test that scrolling rebakes only the rows of the static layer."""
+        self.menu.display()
+        layer = self.menu.layer
+        self.assertEqual(self.bg.surface.get_at(self.menu.heading_rect.center),
+                         layer.get_at(self.menu.heading_rect.center))
+
+        self.menu.scroll(1)
+        self.assertEqual(self.menu.stale_rects, [self.menu.rows_rect])
+        self.menu.display()
+        self.assertIs(self.menu.layer, layer)
+        self.assertEqual(self.menu.stale_rects, [])
+        self.assertEqual(self.menu.dirty_rects, [])
+
+    def test_win_chance(self):
+        """Test showing the win chance of each visible mission."""
+        difficulty = DifficultyService(Player())
+        menu = screen.AdventureMenuScreen(self.bg, self.mission_list,
+                                          difficulty)
+        self.assertGreater(menu.rows[0]['image'].get_width(),
+                           self.menu.rows[0]['image'].get_width())
+        self.assertLessEqual(difficulty.misses, len(ENEMY_TEMPLATES))
+
+
+class Keys():
+    """An event source that presses space on every frame."""
+
+    def events(self, current):
+        """Return a space key press."""
+        return [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE,
+                                   unicode=' ')]
+
+
+class AdventureResultScreenTestCase(unittest.TestCase):
+    """Tests for the adventure result screen."""
+
+    def setUp(self):
+        """Create a mission on a headless background."""
+        self.bg = Background(headless=True)
+        pygame.font.init()
+        self.stats = Statistics()
+        self.player = Player()
+        self.mission = MissionList(GameRandom(2)).missions[0]
+
+    def test_resolve(self):
+        """Test resolving combat on creation."""
+        result = screen.AdventureResultScreen(
+                self.bg, self.stats, self.player, self.mission)
+        self.assertFalse(result.resolving)
+        self.assertEqual(self.stats.total(), 1)
+
+    def test_run_async(self):
+        """Test resolving combat in the background while running."""
+        result = screen.AdventureResultScreen(self.bg, self.stats,
+                self.player, self.mission, resolve=False)
+        self.assertTrue(result.resolving)
+        self.assertEqual(self.stats.total(), 0)
+
+        # Key presses are ignored until combat is resolved.
+        screen.Screen.event_source = Keys()
+        try:
+            asyncio.run(result.run_async())
+        finally:
+            screen.Screen.event_source = None
+        self.assertFalse(result.resolving)
+        self.assertEqual(self.stats.total(), 1)
+
+    def test_run_async_failure(self):
+        """Test that a failure to resolve combat ends the screen."""
+        def fail(player, events=None):
+            raise RuntimeError("combat failed")
+        self.mission.resolve_combat = fail
+        result = screen.AdventureResultScreen(self.bg, self.stats,
+                self.player, self.mission, resolve=False)
+
+        screen.Screen.event_source = Keys()
+        try:
+            with self.assertRaises(RuntimeError):
+                asyncio.run(asyncio.wait_for(result.run_async(), 5))
+        finally:
+            screen.Screen.event_source = None
+        self.assertFalse(result.active)
+        self.assertEqual(self.stats.total(), 0)
+
+
+class WaitScreenTestCase(unittest.TestCase):
+    """Tests for the screen shown during background work."""
+
+    def test_wait(self):
+        """Test that the screen closes when the work is done."""
+        bg = Background(headless=True)
+        pygame.font.init()
+
+        async def wait():
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(None, sum, [1, 2])
+            await screen.WaitScreen(bg, "Working...", future).run_async()
+            return future.done()
+
+        self.assertTrue(asyncio.run(asyncio.wait_for(wait(), 5)))
+
+
+class ScreenManagerTestCase(unittest.TestCase):
+    """Tests for reusing screens between transitions."""
+
+    def setUp(self):
+        """Create a screen manager on a headless background."""
+        self.bg = Background(headless=True)
+        pygame.font.init()
+        self.screens = screen.ScreenManager(self.bg)
+        self.player = Player()
+
+    def test_reuse(self):
+        """Test that a screen is constructed once and then reset."""
+        first = self.screens.get(screen.ReadyScreen, self.player)
+        player = Player('Other')
+        second = self.screens.get(screen.ReadyScreen, player)
+        self.assertIs(first, second)
+        self.assertIs(second.player, player)
+
+    def test_character_reset(self):
+        """Test that character stats are re-rendered only if changed."""
+        character = self.screens.get(screen.CharacterScreen, self.player)
+        character.display()
+        self.screens.get(screen.CharacterScreen, self.player)
+        self.assertEqual(character.stale_rects, [])
+
+        self.player.max_hp = 20
+        self.screens.get(screen.CharacterScreen, self.player)
+        self.assertEqual(character.stale_rects, [None])
+
+    def test_result_reset(self):
+        """Test that a reused result screen fights the new mission."""
+        stats = Statistics()
+        missions = MissionList(GameRandom(4)).missions
+        result = self.screens.get(screen.AdventureResultScreen, stats,
+                                  self.player, missions[0])
+        self.screens.get(screen.AdventureResultScreen, stats,
+                         self.player, missions[1])
+        self.assertIs(result.mission, missions[1])
+        self.assertIsNotNone(missions[1].result)
+        self.assertEqual(stats.total(), 2)
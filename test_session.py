@@ -0,0 +1,52 @@
+import os
+import unittest
+import tempfile
+
+import pygame
+
+import session
+from background import Background
+
+class SessionTestCase(unittest.TestCase):
+    """Tests for replaying game sessions."""
+
+    def setUp(self):
+        """Create a headless background."""
+        self.bg = Background(headless=True)
+        pygame.font.init()
+
+    def test_generated_sessions(self):
+        """Test that seeded generated sessions are reproducible."""
+        first, elapsed = session.run_sessions(20, 3, seed=2)
+        second, elapsed = session.run_sessions(20, 3, seed=2)
+        self.assertEqual(first.total(), 60)
+        self.assertEqual(vars(first), vars(second))
+
+    def test_recorded_session(self):
+        """Test replaying a recorded session from a file."""
+        space = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE,
+                                   unicode=' ')
+        frames = [[pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a,
+                                      unicode='a')],
+                  [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN,
+                                      unicode='\r')],
+                  [space],
+                  [pygame.event.Event(pygame.MOUSEBUTTONDOWN,
+                                      pos=(300, 200), button=1)],
+                  [space]]
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, 'session.jsonl')
+        recorder = session.Recorder(path, seed=3)
+        for frame in frames:
+            for event in frame:
+                pygame.event.post(event)
+            recorder.events(session.screen.Screen(self.bg))
+        recorder.file.close()
+
+        recording = session.RecordedInput.load(path)
+        self.assertEqual(recording.seed, 3)
+        stats = session.run_session(self.bg, recording,
+                session.GameRandom(recording.seed))
+        self.assertEqual(stats.total(), 1)
@@ -0,0 +1,47 @@
+import io
+import json
+import unittest
+
+import simulate
+
+class SimulateTestCase(unittest.TestCase):
+    """Tests for the batch combat simulator."""
+
+    configs = [((10, (1, 3), 0.1), None), ((10, (1, 3), 0.1), 'Rat')]
+
+    def test_rows(self):
+        """Test that every configuration runs every fight in order."""
+        rows = list(simulate.simulate(
+                simulate.make_chunks(self.configs, 250, chunk_size=100)))
+        self.assertEqual([row[0] for row in rows], list(range(500)))
+        self.assertEqual({row[5] for row in rows[250:]}, {'Rat'})
+
+    def test_workers(self):
+        """Test that seeded results do not depend on the workers."""
+        results = [list(simulate.simulate(simulate.make_chunks(
+                           self.configs, 120, chunk_size=50, seed=3),
+                       workers)) for workers in (1, 2)]
+        self.assertEqual(results[0], results[1])
+
+    def test_writers(self):
+        """Test writing JSONL and CSV."""
+        rows = list(simulate.simulate(
+                simulate.make_chunks(self.configs[:1], 3)))
+        output = io.StringIO()
+        simulate.write_jsonl(rows, output)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(list(json.loads(lines[0])), list(simulate.FIELDS))
+
+        output = io.StringIO()
+        simulate.write_csv(rows, output)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[0], ",".join(simulate.FIELDS))
+        self.assertEqual(len(lines), 4)
+
+    def test_progress(self):
+        """Test that progress passes rows through and reports a rate."""
+        stream = io.StringIO()
+        rows = list(simulate.progress(range(5), 5, stream))
+        self.assertEqual(rows, list(range(5)))
+        self.assertIn("5/5 fights", stream.getvalue())
@@ -1,6 +1,10 @@
+import sys
+import threading
+import subprocess
 import unittest
+from array import array
 
-from stats import Statistics
+from stats import Statistics, ShardedStatistics
 import mission
 
 class StatisticsTestCase(unittest.TestCase):
@@ -24,3 +28,70 @@ class StatisticsTestCase(unittest.TestCase):
         stats.update(mission.RETREAT)
         self.assertEqual(stats.retreats, 1)
 
+    def test_no_pygame(self):
+        """Test that counting results does not import pygame."""
+        code = "import sys, stats, balance; sys.exit('pygame' in sys.modules)"
+        result = subprocess.run([sys.executable, '-c', code])
+        self.assertEqual(result.returncode, 0)
+
+    def test_update_many(self):
+        """Test recording many results at once."""
+        stats = Statistics()
+        stats.update_many(array('B', [mission.WIN, mission.WIN,
+                                      mission.LOSE, mission.RETREAT]))
+        self.assertEqual((stats.wins, stats.losses, stats.retreats),
+                         (2, 1, 1))
+
+    def test_update_many_numpy(self):
+        """Test recording 1-D and 2-D NumPy arrays of results."""
+        import numpy as np
+        stats = Statistics()
+        stats.update_many(np.array([mission.LOSE, mission.RETREAT,
+                                    mission.RETREAT]))
+        self.assertEqual((stats.wins, stats.losses, stats.retreats),
+                         (0, 1, 2))
+        stats = Statistics()
+        stats.update_many(np.array([[mission.WIN, mission.LOSE],
+                                    [mission.RETREAT, mission.RETREAT]]))
+        self.assertEqual((stats.wins, stats.losses, stats.retreats),
+                         (1, 1, 2))
+
+    def test_snapshot(self):
+        """Test that a snapshot does not follow later results."""
+        stats = Statistics()
+        stats.update(mission.WIN)
+        snapshot = stats.snapshot()
+        stats.update(mission.WIN)
+        self.assertEqual(snapshot.wins, 1)
+
+
+class ShardedStatisticsTestCase(unittest.TestCase):
+    """Tests for ShardedStatistics class."""
+
+    def test_threads(self):
+        """Test counting from many threads at once."""
+        stats = ShardedStatistics()
+
+        def count():
+            for i in range(1000):
+                stats.update(mission.WIN)
+            stats.update_many([mission.LOSE] * 10)
+
+        threads = [threading.Thread(target=count) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        snapshot = stats.snapshot()
+        self.assertEqual((snapshot.wins, snapshot.losses), (8000, 80))
+        self.assertEqual(len(stats.shards), 8)
+
+    def test_merge(self):
+        """Test adding results counted in another process."""
+        stats = ShardedStatistics()
+        other = Statistics()
+        other.update(mission.RETREAT)
+        stats.merge(other)
+        stats.update(mission.RETREAT)
+        self.assertEqual(stats.snapshot().retreats, 2)
+        self.assertEqual(stats.total(), 2)